@@ -0,0 +1,62 @@
+"""
+Compares the wall-clock time of a location crawl with the sync and async clients, against a local mock server.
+
+The sync client fetches each location in turn, and the async client gathers every request over its bounded pool.
+
+$ python benchmarks/async_crawl.py --locations 1000 --latency 0.02 --max-connections 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockServer
+from timeseries_client import async_timeseries_client, timeseries_client
+
+
+def crawl(url):
+    with timeseries_client(url) as client:
+        locations = client.getLocationDescriptionList()
+
+        started = perf_counter()
+        location_data = [client.getLocationData(location['Identifier']) for location in locations]
+
+        return location_data, perf_counter() - started
+
+
+async def crawl_async(url, max_connections):
+    async with async_timeseries_client(url, max_connections=max_connections) as client:
+        locations = await client.getLocationDescriptionList()
+
+        started = perf_counter()
+        location_data = await asyncio.gather(*[client.getLocationData(location['Identifier']) for location in locations])
+
+        return location_data, perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--locations', help='The number of locations to crawl', type=int, default=1000)
+    parser.add_argument('--latency', help='The seconds the mock server waits before each reply', type=float, default=0.02)
+    parser.add_argument('--max-connections', help='The connection pool size of the async client', type=int, default=50)
+
+    args = parser.parse_args()
+
+    with MockServer(latency=args.latency, location_count=args.locations) as server:
+        sync_data, sync_seconds = crawl(server.url)
+        async_data, async_seconds = asyncio.run(crawl_async(server.url, args.max_connections))
+
+    assert async_data == sync_data
+
+    print(f'{args.locations}-location crawl, {args.latency * 1000:.0f}ms server latency:')
+    print(f'  timeseries_client:                          {sync_seconds:6.2f}s')
+    print(f'  async_timeseries_client(max_connections={args.max_connections}): {async_seconds:6.2f}s'
+          f' ({sync_seconds / async_seconds:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
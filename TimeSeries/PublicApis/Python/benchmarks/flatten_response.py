@@ -0,0 +1,157 @@
+"""
+Compares flattenResponse() with the vectorized flattenResponseIndexes(), and checks that both resolve the same metadata.
+
+The synthetic corrected data response has 15-minute points, with Grades, Approvals, Methods and GapTolerances
+changing every 1k to 50k points, plus overlapping Qualifiers and Notes.
+
+$ python benchmarks/flatten_response.py --points 1000000 10000000
+
+The point dictionaries of a 10M point response, with the six keys flattenResponse() adds to every point,
+need around 16GB of memory. Use --vectorized-only to time just flattenResponseIndexes() on smaller machines.
+"""
+import argparse
+import gc
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries_client import OverlappingMetadataResolver, parse_timestamps, timeseries_client
+
+START = np.datetime64('2000-01-01T08:00:00', 'us')
+INTERVAL = np.timedelta64(15, 'm')
+UTC_OFFSET = np.timedelta64(-8, 'h')
+
+
+def format_timestamps(times):
+    """Formats UTC datetime64 times as AQTS timestamps, with 7 fraction digits and a -08:00 offset"""
+    text = np.datetime_as_string(times + UTC_OFFSET, unit='us')
+    return np.char.add(text, '0-08:00')
+
+
+def create_periods(point_times, step, key, overlap=None):
+    """Creates one period every step points, leaving a 2-hour gap after every third period"""
+    starts = point_times[::step]
+    ends = starts[1:] - np.where(np.arange(len(starts) - 1) % 3 == 0, np.timedelta64(2, 'h'), np.timedelta64(0, 'h'))
+
+    if overlap is not None:
+        ends = ends + overlap
+
+    return [{'StartTime': start, 'EndTime': end, key: i}
+            for i, (start, end) in enumerate(zip(format_timestamps(starts[:-1]).tolist(), format_timestamps(ends).tolist()))]
+
+
+def create_response(point_count, with_points=True):
+    point_times = START + np.arange(point_count) * INTERVAL
+    overlap = np.timedelta64(5, 'D')
+
+    response = {
+        'Grades': create_periods(point_times, 997, 'GradeCode'),
+        'Approvals': create_periods(point_times, 5003, 'ApprovalLevel'),
+        'Methods': create_periods(point_times, 20011, 'MethodCode'),
+        'GapTolerances': create_periods(point_times, 50021, 'ToleranceInMinutes'),
+        'Qualifiers': create_periods(point_times, 3001, 'Identifier', overlap),
+        'Notes': create_periods(point_times, 7001, 'NoteText', overlap),
+    }
+
+    if with_points:
+        response['Points'] = [{'Timestamp': timestamp, 'Value': {'Numeric': 1.0}}
+                              for timestamp in format_timestamps(point_times).tolist()]
+
+    return response, point_times
+
+
+def check_identical(response, indexes):
+    """Checks that flattenResponse() resolved the same items as flattenResponseIndexes()"""
+    points = response['Points']
+
+    for name, key in (('Grades', 'GradeCode'), ('Approvals', 'Approval'), ('Methods', 'Method'), ('GapTolerances', 'GapTolerance')):
+        positions = {id(item): i for i, item in enumerate(response[name])}
+        expected = np.array([positions[id(point[key])] if point[key] is not None else -1 for point in points])
+
+        assert np.array_equal(expected, indexes[name]), f'{name} differ'
+
+    for name in ('Qualifiers', 'Notes'):
+        firsts, stops = indexes[name]
+
+        for item, first, stop in zip(response[name], firsts, stops):
+            # Check the first and last covered points, and their uncovered neighbours
+            for i in {first, stop - 1} if stop > first else set():
+                assert any(applied is item for applied in points[i][name]), f'{name} differ at point {i}'
+
+            for i in (first - 1, stop):
+                if 0 <= i < len(points):
+                    assert not any(applied is item for applied in points[i][name]), f'{name} differ at point {i}'
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--points', help='The point counts to measure', type=int, nargs='+', default=[1000000])
+    parser.add_argument('--vectorized-only', help='Only time flattenResponseIndexes(), without building point dictionaries', action='store_true')
+
+    args = parser.parse_args()
+
+    # Neither method needs a connection to a server
+    client = timeseries_client.__new__(timeseries_client)
+
+    for point_count in args.points:
+        response, point_times = create_response(point_count, with_points=not args.vectorized_only)
+
+        if args.vectorized_only:
+            timestamps = format_timestamps(point_times)
+
+            started = perf_counter()
+            parsed = parse_timestamps(timestamps, as_datetime64=True)
+            parse_seconds = perf_counter() - started
+
+            started = perf_counter()
+            client.flattenResponseIndexes(response, timestamps=parsed)
+            resolve_seconds = perf_counter() - started
+
+            print(f'{point_count} points: flattenResponseIndexes {parse_seconds + resolve_seconds:.2f}s'
+                  f' (parse {parse_seconds:.2f}s + resolve {resolve_seconds:.2f}s)')
+            continue
+
+        started = perf_counter()
+        indexes = client.flattenResponseIndexes(response)
+        vectorized_seconds = perf_counter() - started
+
+        started = perf_counter()
+        client.flattenResponse(response)
+        flatten_seconds = perf_counter() - started
+
+        check_identical(response, indexes)
+
+        print(f'{point_count} points: flattenResponse {flatten_seconds:.2f}s,'
+              f' flattenResponseIndexes {vectorized_seconds:.2f}s ({flatten_seconds / vectorized_seconds:.1f}x faster), identical')
+
+        del response, indexes
+        gc.collect()
+
+    # The sweep-line resolver used by flattenResponse() for the overlapping Qualifiers and Notes
+    response, point_times = create_response(200000, with_points=False)
+    timestamps = format_timestamps(point_times).tolist()
+    qualifiers = create_periods(point_times, 40, 'Identifier', np.timedelta64(1000, 'h'))
+
+    started = perf_counter()
+    resolver = OverlappingMetadataResolver(qualifiers)
+    one_at_a_time = [resolver.resolve(timestamp) for timestamp in timestamps]
+    resolve_seconds = perf_counter() - started
+
+    started = perf_counter()
+    all_at_once = OverlappingMetadataResolver(qualifiers).resolve_all(timestamps)
+    resolve_all_seconds = perf_counter() - started
+
+    assert all(len(a) == len(b) and all(x is y for x, y in zip(a, b)) for a, b in zip(one_at_a_time, all_at_once))
+
+    print(f'OverlappingMetadataResolver, 200000 points and {len(qualifiers)} qualifiers,'
+          f' about {sum(map(len, all_at_once)) // len(all_at_once)} active per point:'
+          f' resolve {resolve_seconds:.2f}s, resolve_all {resolve_all_seconds:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Measures the decode and encode time per MB of each installed JsonCodec backend.
+
+The body is a synthetic GetTimeSeriesCorrectedData response, like a one-year, 1-minute series.
+The requests Response.json() row is the decoder used before the pluggable codecs were added.
+
+$ python benchmarks/json_codecs.py --points 500000
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries_client import JsonCodec
+
+
+def create_body(point_count):
+    """Creates the UTF-8 JSON body of a corrected data response, with one point per minute"""
+    start = datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=-8)))
+
+    points = [{
+        'Timestamp': (start + timedelta(minutes=i)).isoformat(timespec='microseconds')[:26] + '0-08:00',
+        'Value': {'Numeric': round(10 + i % 1440 / 100, 3), 'Display': f'{10 + i % 1440 / 100:.3f}'}}
+        for i in range(point_count)]
+
+    return json.dumps({
+        'UniqueId': '0123456789abcdef0123456789abcdef',
+        'Unit': 'm',
+        'Approvals': [{'ApprovalLevel': 1200, 'LevelDescription': 'Approved',
+                       'StartTime': points[0]['Timestamp'], 'EndTime': points[-1]['Timestamp']}],
+        'Grades': [{'GradeCode': 50, 'StartTime': points[0]['Timestamp'], 'EndTime': points[-1]['Timestamp']}],
+        'Points': points}).encode('utf-8')
+
+
+def best_time(func, repeat):
+    """The fastest of several runs, in seconds"""
+    best = None
+
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--points', help='The number of points in the response body', type=int, default=200000)
+    parser.add_argument('--repeat', help='The number of runs of each measurement. The fastest run is reported.', type=int, default=3)
+
+    args = parser.parse_args()
+
+    body = create_body(args.points)
+    megabytes = len(body) / 1e6
+    expected = json.loads(body)
+
+    print(f'{args.points} points, {megabytes:.1f} MB body')
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers['Content-Type'] = 'application/json'
+
+    seconds = best_time(response.json, args.repeat)
+    print(f'{"requests Response.json()":26} decode {seconds / megabytes * 1000:6.1f} ms/MB')
+
+    for backend in ('json', 'ujson', 'orjson'):
+        try:
+            codec = JsonCodec(backend)
+        except ValueError:
+            print(f'{backend:26} not installed')
+            continue
+
+        assert codec.loads(body) == expected
+
+        decode = best_time(lambda: codec.loads(body), args.repeat)
+        encode = best_time(lambda: codec.dumps(expected), args.repeat)
+
+        print(f'{"JsonCodec(" + repr(backend) + ")":26} decode {decode / megabytes * 1000:6.1f} ms/MB,'
+              f' encode {encode / megabytes * 1000:6.1f} ms/MB')
+
+    print(f'The default codec is {JsonCodec()!r}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+A tiny threaded mock of the AQTS public APIs, serving just enough routes for the benchmarks.
+
+Every request waits for the configured latency before replying, like a real server across a network.
+
+>>> with MockServer(latency=0.02) as server:
+...   with timeseries_client(server.url) as client:
+...     locations = client.getLocationDescriptionList()
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def create_points(point_count, start=datetime(1990, 1, 1, tzinfo=timezone(timedelta(hours=-8))), interval=timedelta(minutes=30)):
+    """Creates corrected data points, in the AQTS wire format"""
+    return [{
+        'Timestamp': (start + i * interval).isoformat(timespec='microseconds')[:26] + '0-08:00',
+        'Value': {'Numeric': float(i % 1000), 'Display': str(i % 1000)}}
+        for i in range(point_count)]
+
+
+class MockServer:
+    """
+    Serves the mock APIs on a free localhost port, from a background thread.
+
+    :param latency: The seconds each request waits before replying
+    :param location_count: The number of locations returned by GetLocationDescriptionList
+    :param point_count: The number of points returned by GetTimeSeriesCorrectedData
+    """
+
+    def __init__(self, latency=0.02, location_count=1000, point_count=100000):
+        self.latency = latency
+        self.locations = [{'Identifier': f'LOC{i:05d}', 'UniqueId': f'{i:032x}', 'Name': f'Location {i}'}
+                          for i in range(location_count)]
+        self.point_count = point_count
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._corrected_data = None
+        self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def start(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Buffer each reply, so its headers and body are sent together
+            wbufsize = -1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                mock._handle(self, 'GET')
+
+            def do_POST(self):
+                mock._handle(self, 'POST')
+
+            def do_DELETE(self):
+                mock._handle(self, 'DELETE')
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def corrected_data_body(self):
+        """The encoded GetTimeSeriesCorrectedData response body, created on first use"""
+        with self._lock:
+            if self._corrected_data is None:
+                points = create_points(self.point_count)
+                self._corrected_data = json.dumps({
+                    'UniqueId': '0123456789abcdef0123456789abcdef',
+                    'Unit': 'm',
+                    'Approvals': [{'ApprovalLevel': 1200, 'StartTime': points[0]['Timestamp'], 'EndTime': '9999-12-31T23:59:59.9999999Z'}],
+                    'Grades': [{'GradeCode': 50, 'StartTime': points[0]['Timestamp'], 'EndTime': '9999-12-31T23:59:59.9999999Z'}],
+                    'Points': points}).encode('utf-8')
+
+            return self._corrected_data
+
+    def _handle(self, handler, verb):
+        url = urlparse(handler.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        length = int(handler.headers.get('Content-Length') or 0)
+
+        if length:
+            handler.rfile.read(length)
+
+        with self._lock:
+            self.request_count += 1
+
+        time.sleep(self.latency)
+
+        status, body = self._reply(verb, url.path, params)
+        content = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8') if body is not None else b''
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _reply(self, verb, path, params):
+        if path.endswith('/session'):
+            return (200, b'token') if verb == 'POST' else (204, None)
+
+        if path.endswith('/apps/v1/version'):
+            return 200, {'ApiVersion': '20.4.100'}
+
+        if path.endswith('/GetLocationDescriptionList'):
+            return 200, {'LocationDescriptions': self.locations}
+
+        if path.endswith('/GetLocationData'):
+            identifier = params.get('LocationIdentifier', '')
+            return 200, {'Identifier': identifier, 'UniqueId': identifier.encode('utf-8').hex()[:32], 'Name': identifier}
+
+        if path.endswith('/GetTimeSeriesCorrectedData'):
+            return 200, self.corrected_data_body()
+
+        return 404, {'ResponseStatus': {'ErrorCode': 'NotFound', 'Message': path}}
@@ -0,0 +1,125 @@
+"""
+Compares the timestamp parse throughput of pyrfc3339 with parse_timestamps(), and checks they agree on random timestamps.
+
+The equivalence check covers random dates and times, 0 to 7 fraction digits, 'Z' and +/-HH:mm offsets,
+and the 'T24:00:00' end-of-day form, which pyrfc3339 parses as midnight of the following day once normalized.
+
+$ python benchmarks/parse_timestamps.py --timestamps 1000000 --random 200000
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+import numpy as np
+import pyrfc3339
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeseries_client import parse_timestamps, timeseries_client
+
+
+def reference_parse(text):
+    """The parse of the original timeseries_client.datetime(), using pyrfc3339"""
+    if text[10:19] == 'T24:00:00':
+        return pyrfc3339.parse(text[:11] + '00' + text[13:]) + timedelta(days=1)
+
+    return pyrfc3339.parse(text)
+
+
+def random_timestamp(rng):
+    day = datetime(1900, 1, 1) + timedelta(days=rng.randrange(73000))
+    time = '24:00:00' if rng.random() < 0.02 else f'{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}'
+    fraction_digits = rng.randrange(8)
+    fraction = '.' + ''.join(rng.choice('0123456789') for _ in range(fraction_digits)) if fraction_digits else ''
+
+    if time == '24:00:00':
+        fraction = '.' + '0' * fraction_digits if fraction_digits else ''
+
+    if rng.random() < 0.2:
+        offset = 'Z'
+    else:
+        offset = f'{rng.choice("+-")}{rng.randrange(15):02d}:{rng.choice((0, 30, 45)):02d}'
+
+    return f'{day:%Y-%m-%d}T{time}{fraction}{offset}'
+
+
+def check_equivalence(count, seed):
+    """Checks every parser against pyrfc3339 on random timestamps, returning the number of mismatches"""
+    rng = random.Random(seed)
+    timestamps = [random_timestamp(rng) for _ in range(count)]
+    expected = [reference_parse(text) for text in timestamps]
+
+    datetimes = parse_timestamps(timestamps)
+    utc_times = parse_timestamps(timestamps, as_datetime64=True)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    mismatches = 0
+
+    for text, reference, parsed, utc_time in zip(timestamps, expected, datetimes, utc_times):
+        single = timeseries_client.datetime(text)
+        expected_utc = np.datetime64((reference - epoch) // timedelta(microseconds=1), 'us')
+
+        if any(actual != reference or actual.utcoffset() != reference.utcoffset() for actual in (parsed, single)) \
+                or utc_time != expected_utc:
+            mismatches += 1
+
+            if mismatches <= 10:
+                print(f'  Mismatch: {text} => {reference!r}, {parsed!r}, {single!r}, {utc_time!r}')
+
+    return mismatches
+
+
+def best_time(func, repeat):
+    """The fastest of several runs, in seconds"""
+    best = None
+
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--timestamps', help='The number of AQTS timestamps to parse in the throughput test', type=int, default=1000000)
+    parser.add_argument('--random', help='The number of random timestamps in the equivalence check', type=int, default=200000)
+    parser.add_argument('--seed', help='The random seed of the equivalence check', type=int, default=1)
+    parser.add_argument('--repeat', help='The number of runs of each measurement. The fastest run is reported.', type=int, default=3)
+
+    args = parser.parse_args()
+
+    mismatches = check_equivalence(args.random, args.seed)
+    print(f'{args.random} random timestamps: {mismatches} mismatches with pyrfc3339')
+
+    start = datetime(2000, 1, 1)
+    timestamps = [f'{start + timedelta(minutes=15 * i):%Y-%m-%dT%H:%M:%S}.0000000-08:00' for i in range(args.timestamps)]
+
+    rows = [
+        ('pyrfc3339.parse', lambda: [reference_parse(text) for text in timestamps]),
+        ('timeseries_client.datetime', lambda: [timeseries_client.datetime(text) for text in timestamps]),
+        ('parse_timestamps', lambda: parse_timestamps(timestamps)),
+        ('parse_timestamps as_datetime64', lambda: parse_timestamps(timestamps, as_datetime64=True)),
+    ]
+
+    print(f'{args.timestamps} AQTS timestamps, pyrfc3339 {getattr(pyrfc3339, "__version__", "")}:')
+
+    baseline = None
+
+    for name, func in rows:
+        seconds = best_time(func, args.repeat)
+        baseline = baseline or seconds
+        print(f'  {name:32} {seconds:6.2f}s  {args.timestamps / seconds / 1e6:5.2f}M/s  ({baseline / seconds:.1f}x)')
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
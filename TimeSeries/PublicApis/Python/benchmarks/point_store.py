@@ -0,0 +1,104 @@
+"""
+Compares cold reads of a series from a local mock server with warm memory-mapped reads from a PointStore,
+and measures the cost of appending newer points to the stored series.
+
+$ python benchmarks/point_store.py --points 500000 --appends 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from time import perf_counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_server import MockServer
+from timeseries_client import PointStore, TimeSeriesPoints, timeseries_client
+
+UNIQUE_ID = '0123456789abcdef0123456789abcdef'
+
+
+def best_time(func, repeat):
+    """The fastest of several runs, in seconds, and the result of the last run"""
+    best = None
+
+    for _ in range(repeat):
+        started = perf_counter()
+        result = func()
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+def create_appended_points(after, count, interval=np.timedelta64(30, 'm')):
+    """Creates count points following the after time"""
+    timestamps = after + interval * np.arange(1, count + 1)
+
+    return TimeSeriesPoints(
+        timestamps.astype('datetime64[us]'), None, np.arange(count, dtype=np.float64),
+        np.full(count, 50, dtype=np.int32), np.full(count, 1200, dtype=np.int32), {})
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('--points', help='The number of half-hourly points in the series', type=int, default=500000)
+    parser.add_argument('--appends', help='The number of appends of one day of points', type=int, default=1000)
+    parser.add_argument('--repeat', help='The number of runs of each read. The fastest run is reported.', type=int, default=5)
+    parser.add_argument('--directory', help='The store directory. Defaults to a new temporary directory.')
+
+    args = parser.parse_args()
+
+    directory = args.directory or tempfile.mkdtemp(prefix='point_store_')
+    store = PointStore(directory)
+
+    with MockServer(latency=0.02, point_count=args.points) as server:
+        server.corrected_data_body()
+
+        with timeseries_client(server.url) as client:
+            cold_seconds, cold = best_time(lambda: client.getTimeSeriesCorrectedDataColumns(UNIQUE_ID), 1)
+
+            started = perf_counter()
+            store.download(client, UNIQUE_ID)
+            download_seconds = perf_counter() - started
+
+    full_seconds, warm = best_time(lambda: store.read(UNIQUE_ID), args.repeat)
+
+    assert np.array_equal(warm.timestamps, cold.timestamps)
+    assert np.array_equal(warm.values, cold.values, equal_nan=True)
+    assert np.array_equal(warm.grade_codes, cold.grade_codes)
+    assert np.array_equal(warm.approval_levels, cold.approval_levels)
+
+    mean_seconds, _ = best_time(lambda: np.nanmean(store.read(UNIQUE_ID).values), args.repeat)
+
+    year_start = warm.timestamps[len(warm) // 2].astype(datetime).replace(tzinfo=timezone.utc)
+    year_end = year_start.replace(year=year_start.year + 1)
+    range_seconds, year = best_time(lambda: store.read(UNIQUE_ID, start=year_start, end=year_end), args.repeat)
+
+    started = perf_counter()
+    for _ in range(args.appends):
+        store.append(UNIQUE_ID, create_appended_points(store.read(UNIQUE_ID).timestamps[-1], 48))
+    append_seconds = perf_counter() - started
+
+    assert len(store.read(UNIQUE_ID)) == args.points + 48 * args.appends
+
+    print(f'{args.points} half-hourly points, in {directory}:')
+    print(f'  cold read through getTimeSeriesCorrectedDataColumns: {cold_seconds:8.3f}s')
+    print(f'  download into the store:                             {download_seconds:8.3f}s')
+    print(f'  warm full read:                                      {full_seconds * 1000:8.2f}ms, identical to the cold read')
+    print(f'  warm full read plus nanmean:                         {mean_seconds * 1000:8.2f}ms')
+    print(f'  warm 1-year range read:                              {range_seconds * 1000:8.2f}ms, {len(year)} points')
+    print(f'  appends of 48 points:                                {append_seconds:8.3f}s,'
+          f' {append_seconds / args.appends * 1000:.2f}ms per append over {args.appends} appends')
+
+    if args.directory is None:
+        store.delete(UNIQUE_ID)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,5 +11,9 @@ setup(
     install_requires=(
         "requests",
         "pyrfc3339"
-    )
+    ),
+    extras_require={
+        "fast": ("orjson",),
+        "numpy": ("numpy",)
+    }
 )
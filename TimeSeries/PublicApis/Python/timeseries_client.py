@@ -1,20 +1,64 @@
 # Sample python code to Public API course
 # Requires python 3.7+
 # Install required dependencies via: $ pip install requests pytz pyrfc3339
-
+# Optionally install orjson (or ujson) for faster JSON encoding and decoding
+# Optionally install numpy (and pandas) for columnar point data
+
+from collections import OrderedDict, deque
+from contextlib import closing
+from contextlib import contextmanager
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
 from functools import total_ordering
+from itertools import islice
 from urllib.parse import urlparse
+import asyncio
+import codecs
+import hashlib
+import heapq
+import inspect
+import json
 import os
 import platform
+import random
 import pyrfc3339
 import requests
+from requests.adapters import HTTPAdapter
+from requests import exceptions as requests_exceptions
 from requests.exceptions import HTTPError
+from requests.models import RequestEncodingMixin
 import re
+import sqlite3
 import subprocess
+import threading
+from time import perf_counter
 from time import sleep
 
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 
 def create_endpoint(hostname, root_path):
     prefix = "http://"
@@ -25,7 +69,12 @@ def create_endpoint(hostname, root_path):
 
 def response_or_raise(response):
     if response.status_code >= 400:
-        json = response.json()
+        try:
+            json = response.json()
+        except ValueError:
+            # Proxies and gateways can respond with non-JSON error pages
+            json = None
+
         if isinstance(json, dict):
             error_summary = ''
 
@@ -51,6 +100,274 @@ def response_or_raise(response):
     return response
 
 
+def batches(items, batch_size):
+    """
+    Lazily splits any iterable into lists of at most batch_size items
+
+    :param items: Any iterable, including a lazy generator
+    :param batch_size: The batch size, or a callable returning the size of the next batch
+    :return: A generator of lists
+    """
+    iterator = iter(items)
+
+    while True:
+        batch = list(islice(iterator, batch_size() if callable(batch_size) else batch_size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def ordered_concurrent_map(func, items, max_concurrency=1):
+    """
+    Lazily applies func to each item of an iterable, yielding the results in item order.
+
+    Up to max_concurrency calls are in flight on a worker pool at once, and items are only
+    consumed from the iterable as fast as the results are consumed by the caller.
+
+    :param func: The function to apply to each item
+    :param items: Any iterable, including a lazy generator
+    :param max_concurrency: The maximum number of concurrent calls (defaults to 1, calling func in the caller's thread)
+    :return: A generator of results
+    """
+    if max_concurrency <= 1:
+        yield from map(func, items)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        in_flight = deque()
+
+        try:
+            for item in items:
+                in_flight.append(executor.submit(func, item))
+
+                if len(in_flight) >= max_concurrency:
+                    yield in_flight.popleft().result()
+
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            # Don't start any queued work once the caller has stopped consuming results
+            for future in in_flight:
+                future.cancel()
+
+
+class AdaptiveBatchSize:
+    """
+    A batch size which adapts at runtime to the measured latency and response size of each completed batch.
+
+    The size grows while batches complete well within the target time and response size,
+    shrinks when they don't, and is halved whenever a batch is rejected as too big.
+    A rejected size is never attempted again by the same object.
+
+    >>> batch_size = AdaptiveBatchSize(initial_size=500, target_seconds=2)
+    >>> responses = client.publish.send_batch_requests('/GetLocationData', requests, batch_size=batch_size)
+    >>> print(batch_size.size)
+    """
+
+    def __init__(self, initial_size=100, target_seconds=5.0, max_bytes=10000000, min_size=1, max_size=5000):
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = self._clamp(initial_size)
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.size
+
+    def _clamp(self, size):
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def record_success(self, batch_size, seconds, response_bytes):
+        """Adjusts the size towards the largest batch that would meet both the time and response size targets"""
+        ideal_size = self.max_size
+
+        if seconds > 0:
+            ideal_size = min(ideal_size, self.target_seconds * batch_size / seconds)
+
+        if response_bytes > 0:
+            ideal_size = min(ideal_size, self.max_bytes * batch_size / response_bytes)
+
+        with self._lock:
+            # Move at most a factor of 2 per batch, to ride out any noisy measurements
+            self.size = self._clamp(min(max(ideal_size, self.size / 2), self.size * 2))
+
+    def record_failure(self, batch_size, too_big=True):
+        """
+        Halves the size after a batch failed.
+
+        :param batch_size: The size of the failed batch
+        :param too_big: When True, the batch was rejected as too big, and the size never grows back to the rejected size.
+                        When False, the failure may have been transient, so the size can grow back after later successes.
+        """
+        with self._lock:
+            if too_big:
+                self.max_size = max(self.min_size, min(self.max_size, batch_size - 1))
+
+            self.size = self._clamp(min(self.size, batch_size // 2))
+
+
+class JsonCodec:
+    """
+    Encodes and decodes JSON bodies using the orjson, ujson, or standard json library.
+
+    The default codec of every session uses the fastest library installed. Install orjson for the best performance.
+
+    >>> session.json_codec = JsonCodec('json')  # Use the standard library, even if orjson or ujson is installed
+    """
+
+    def __init__(self, backend=None):
+        if backend is None:
+            backend = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+
+        if backend == 'orjson' and orjson is not None:
+            self._loads = orjson.loads
+            self._dumps = orjson.dumps
+        elif backend == 'ujson' and ujson is not None:
+            self._loads = ujson.loads
+            self._dumps = lambda item: ujson.dumps(item, ensure_ascii=False).encode('utf-8')
+        elif backend == 'json':
+            self._loads = json.loads
+            self._dumps = lambda item: json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        else:
+            raise ValueError(f"JSON backend '{backend}' is not installed or not supported")
+
+        self.backend = backend
+
+    def __repr__(self):
+        return f'JsonCodec({self.backend!r})'
+
+    def loads(self, content):
+        """Decodes JSON text or UTF-8 bytes"""
+        return self._loads(content)
+
+    def dumps(self, item):
+        """Encodes the item as compact UTF-8 JSON bytes"""
+        return self._dumps(item)
+
+
+default_json_codec = JsonCodec()
+
+
+def create_transport(pool_size=10, pool_block=False):
+    """
+    Creates a pooled HTTP transport, which can be shared by many sessions to the same server.
+
+    :param pool_size: The maximum number of pooled keep-alive connections to each host
+    :param pool_block: When True, requests wait for a free pooled connection instead of opening a throw-away connection
+    :return: A transport adapter to mount on each session
+    """
+    return HTTPAdapter(pool_maxsize=pool_size, pool_block=pool_block)
+
+
+class RetryPolicy:
+    """
+    Retries failed idempotent requests, using a capped exponential backoff with full jitter.
+
+    A request is retried when the connection fails or times out, or when the server responds with
+    one of the retry_statuses. A Retry-After response header from the server takes precedence over the backoff.
+
+    Only idempotent requests are retried. A POST which overrides its verb with an X-Http-Method-Override
+    header is retried according to that verb, so auto-batched GET requests are retried too.
+
+    >>> session.retry_policy = RetryPolicy(max_retries=5, max_backoff=timedelta(minutes=1))
+    >>> ... # Later
+    >>> print(session.retry_policy.counters)
+    {'requests': 12345, 'retries': 12, 'recovered': 4, 'exhausted': 0, 'statuses': {503: 11}, 'errors': {'ConnectionError': 1}}
+    """
+
+    idempotent_verbs = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+    def __init__(self, max_retries=3, backoff=timedelta(milliseconds=500), max_backoff=timedelta(seconds=30),
+                 retry_statuses=(429, 502, 503, 504), max_retry_after=timedelta(minutes=5)):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = set(retry_statuses)
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self.counters = None
+        self.reset_counters()
+
+    def reset_counters(self):
+        with self._lock:
+            self.counters = {'requests': 0, 'retries': 0, 'recovered': 0, 'exhausted': 0, 'statuses': {}, 'errors': {}}
+
+    def is_retryable(self, method, **kwargs):
+        """Is the request safe to send again"""
+        if 'files' in kwargs or hasattr(kwargs.get('data'), 'read'):
+            # A streamed request body can't be replayed
+            return False
+
+        verb = (kwargs.get('headers') or {}).get('X-Http-Method-Override', method)
+
+        return verb.upper() in self.idempotent_verbs
+
+    def should_retry(self, attempt, response=None, error=None):
+        """Should the failed attempt be retried. Exactly one of the response or the error is set."""
+        if error is not None:
+            if not isinstance(error, (requests_exceptions.ConnectionError, requests_exceptions.Timeout)):
+                return False
+
+            self._count('errors', type(error).__name__)
+        elif response.status_code in self.retry_statuses:
+            self._count('statuses', response.status_code)
+        else:
+            return False
+
+        if attempt >= self.max_retries:
+            with self._lock:
+                self.counters['exhausted'] += 1
+
+            return False
+
+        with self._lock:
+            self.counters['retries'] += 1
+
+        return True
+
+    def _count(self, category, key):
+        with self._lock:
+            self.counters[category][key] = self.counters[category].get(key, 0) + 1
+
+    def record_request(self, attempts, succeeded):
+        with self._lock:
+            self.counters['requests'] += 1
+
+            if attempts > 0 and succeeded:
+                self.counters['recovered'] += 1
+
+    def get_delay(self, attempt, response=None):
+        """Gets the delay in seconds before the next attempt"""
+        retry_after = self._parse_retry_after(response)
+
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after.total_seconds())
+
+        # Full jitter spreads the retries of many concurrent clients across the whole backoff window
+        backoff = min(self.max_backoff.total_seconds(), self.backoff.total_seconds() * 2 ** attempt)
+
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def _parse_retry_after(response):
+        if response is None or 'Retry-After' not in response.headers:
+            return None
+
+        retry_after = response.headers['Retry-After'].strip()
+
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        try:
+            # An HTTP-date, like "Wed, 21 Oct 2015 07:28:00 GMT"
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
 class ModelNotFoundException(Exception):
     """Exception raised for errors in the input.
 
@@ -129,24 +446,187 @@ class ServerVersion(object):
         return versions
 
 
+class StreamedJsonResponse:
+    """
+    A JSON object response with one large array which is parsed incrementally, as the response body arrives.
+
+    Iterating over the response yields the items of the streamed array, in lists of at most chunk_size items.
+    All the other properties of the JSON object are collected into the properties dictionary.
+    Properties which precede the array in the response body are available as soon as the first chunk is yielded,
+    and every property is available once all the chunks have been consumed.
+
+    Peak memory depends on the chunk size, not on the length of the array.
+
+    >>> with client.publish.get_streamed('/GetTimeSeriesCorrectedData', 'Points', params=...) as data:
+    ...   for points in data:
+    ...     process(points)
+    ...   approvals = data.properties['Approvals']
+    """
+
+    _whitespace = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, response, array_name, chunk_size=10000, read_size=65536):
+        self.response = response
+        self.array_name = array_name
+        self.chunk_size = chunk_size
+        self.properties = {}
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._chunks = self._parse()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+
+    def __iter__(self):
+        return self._chunks
+
+    def items(self):
+        """Yields the streamed array items one at a time"""
+        for chunk in self:
+            yield from chunk
+
+    def close(self):
+        """Stops parsing and releases the connection"""
+        self._chunks.close()
+        self.response.close()
+
+    def _parse(self):
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._content = self.response.iter_content(self._read_size)
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+        try:
+            self._expect('{')
+
+            while self._next_character() != '}':
+                self._skip(',')
+                name = self._decode_value()
+                self._expect(':')
+
+                if name == self.array_name and self._next_character() == '[':
+                    yield from self._parse_array()
+                else:
+                    self.properties[name] = self._decode_value()
+
+            self._position += 1
+        finally:
+            self.response.close()
+
+    def _parse_array(self):
+        self._expect('[')
+        chunk = []
+
+        while self._next_character() != ']':
+            self._skip(',')
+            chunk.append(self._decode_value())
+
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        self._position += 1
+
+        if chunk:
+            yield chunk
+
+    def _read(self):
+        """Appends more of the response body to the buffer, returning False at the end of the body"""
+        if self._eof:
+            return False
+
+        data = next(self._content, None)
+
+        if data is None:
+            self._buffer += self._text_decoder.decode(b'', final=True)
+            self._eof = True
+            return False
+
+        # Discard everything already parsed
+        self._buffer = self._buffer[self._position:] + self._text_decoder.decode(data)
+        self._position = 0
+        return True
+
+    def _next_character(self):
+        while True:
+            self._position = self._whitespace.match(self._buffer, self._position).end()
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._read():
+                raise ValueError(f'Unexpected end of the JSON response from {self.response.url}')
+
+    def _expect(self, character):
+        if self._next_character() != character:
+            raise ValueError(f"Expected '{character}' at position {self._position} of the JSON response from {self.response.url}")
+
+        self._position += 1
+
+    def _skip(self, character):
+        if self._next_character() == character:
+            self._position += 1
+
+    def _decode_value(self):
+        self._next_character()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+
+                # A number at the very end of the buffer may still be incomplete
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            self._read()
+
+
 class RestSession(requests.sessions.Session):
     """
     A requests.Session object that:
     - Sends all requests to a base endpoint
     - Expects a JSON response body
     - Always raises an exception if any HTTP errors are detected.
+    - Retries idempotent requests after transient failures, as configured by its retry_policy.
+    - Encodes and decodes JSON bodies with its json_codec, the fastest JSON library available.
+    - Serves GET responses from its response_cache, when one is set.
+    - Sends identical concurrent GET requests only once, sharing the response body among all the callers.
 
     >>> session.get('/invalidroute') # Raises HTTPError (404)
     """
     _user_agent = None
     _proxy_configured = None
 
-    def __init__(self, hostname, root_path, verify=True):
+    def __init__(self, hostname, root_path, verify=True, transport=None, retry_policy=None):
         super().__init__()
         self._configure_proxy()
         self.verify = verify
         self.base_url = create_endpoint(hostname, root_path)
         self.headers.update({'User-Agent': self._compose_user_agent()})
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.json_codec = default_json_codec
+        self.response_cache = None
+        self.cache_partition = ''
+        self.coalesce_requests = True
+        self.coalesced_requests = 0
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+        if transport is not None:
+            self.mount_transport(transport)
+
+    def mount_transport(self, transport):
+        """Sends all requests through the given transport, whose connection pool may be shared with other sessions"""
+        self.mount('http://', transport)
+        self.mount('https://', transport)
 
     @staticmethod
     def _compose_user_agent():
@@ -201,7 +681,56 @@ class RestSession(requests.sessions.Session):
         return last_line.lower().startswith(process_name.lower())
 
     def get(self, url, **kwargs):
-        return self.json_or_none(self._get_raw(url, **kwargs))
+        if kwargs.get('stream'):
+            return self.json_or_none(self._get_raw(url, **kwargs))
+
+        content = self._get_content_once(url, **kwargs)
+
+        # Each caller decodes its own copy, so no caller can modify another caller's response
+        return self.json_codec.loads(content) if content else None
+
+    def _get_content_once(self, url, **kwargs):
+        """
+        Gets the body of a GET request, joining any identical request already in flight from another thread.
+
+        Requests with any options other than their params, like custom headers, are never joined.
+        """
+        if not self.coalesce_requests or set(kwargs) - {'params'}:
+            return self._get_content(url, **kwargs)
+
+        key = ResponseCache.create_key(self.base_url + url, kwargs.get('params'), '')
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+
+            if is_leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced_requests += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            content = self._get_content(url, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(content)
+            return content
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _get_content(self, url, **kwargs):
+        if self.response_cache is not None:
+            return self.response_cache.get(self, url, **kwargs)
+
+        response = self._get_raw(url, **kwargs)
+
+        return b'' if response.status_code == 204 else response.content
 
     def post(self, url, data=None, json=None, **kwargs):
         return self.json_or_none(self._post_raw(url, data, json, **kwargs))
@@ -212,681 +741,3191 @@ class RestSession(requests.sessions.Session):
     def delete(self, url, **kwargs):
         return self.json_or_none(self._delete_raw(url, **kwargs))
 
-    @staticmethod
-    def json_or_none(response):
+    def get_streamed(self, url, array_name, chunk_size=10000, **kwargs):
+        """
+        Gets a JSON object response, incrementally parsing one of its arrays as the response arrives.
+
+        :param url: The URL of the get() request
+        :param array_name: The name of the array property to stream, like 'Points'
+        :param chunk_size: The maximum number of array items to yield at once
+        :param kwargs: Other keyword arguments for the get() request
+        :return: A StreamedJsonResponse, which yields chunks of array items
+        """
+        return StreamedJsonResponse(self._get_raw(url, stream=True, **kwargs), array_name, chunk_size)
+
+    def json_or_none(self, response):
         if response.status_code == 204:
             return None
 
-        return response.json()
+        return self.json_codec.loads(response.content)
 
     def _get_raw(self, url, **kwargs):
-        r = super().get(self.base_url + url, verify=self.verify, **kwargs)
-        return response_or_raise(r)
+        return self._request_raw('GET', url, **kwargs)
 
     def _post_raw(self, url, data=None, json=None, **kwargs):
-        r = super().post(self.base_url + url, data, json, verify=self.verify, **kwargs)
-        return response_or_raise(r)
+        return self._request_raw('POST', url, data=data, json=json, **kwargs)
 
     def _put_raw(self, url, data=None, **kwargs):
-        r = super().put(self.base_url + url, data, verify=self.verify, **kwargs)
-        return response_or_raise(r)
+        return self._request_raw('PUT', url, data=data, **kwargs)
 
     def _delete_raw(self, url, **kwargs):
-        r = super().delete(self.base_url + url, verify=self.verify, **kwargs)
-        return response_or_raise(r)
+        return self._request_raw('DELETE', url, **kwargs)
 
+    def _request_raw(self, method, url, **kwargs):
+        if kwargs.get('json') is not None and kwargs.get('data') is None:
+            # Encode the request body with the session's codec, instead of the standard library
+            kwargs['data'] = self.json_codec.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
 
-class ServiceStackSession(RestSession):
-    """
-    A requests.Session object for ServiceStack-based REST services.
+        policy = self.retry_policy
+        retryable = policy is not None and policy.is_retryable(method, **kwargs)
+        attempt = 0
 
-    AQUARIUS TimeSeries and AQUARIUS WebPortal both use ServiceStack back-ends
-    """
+        while True:
+            try:
+                r = super().request(method, self.base_url + url, verify=self.verify, **kwargs)
+            except requests_exceptions.RequestException as e:
+                if not retryable or not policy.should_retry(attempt, error=e):
+                    if policy is not None:
+                        policy.record_request(attempt, succeeded=False)
 
-    def __init__(self, hostname, root_path, verify=True):
-        super().__init__(hostname=hostname, root_path=root_path, verify=verify)
-        self.metadata = None
+                    raise
 
-    def send_batch_requests(self, route_or_operation_name, requests, batch_size=100, verb="GET"):
-        """
-        Performs a batch of identical operations
+                delay = policy.get_delay(attempt)
+            else:
+                if not retryable or not policy.should_retry(attempt, response=r):
+                    if policy is not None:
+                        policy.record_request(attempt, succeeded=r.ok)
 
-        This method is useful for requesting large amounts of similar data from AQTS,
-        taking advantage of ServiceStack's support for auto-batched requests.
+                    return response_or_raise(r)
 
-        http://docs.servicestack.net/auto-batched-requests
+                delay = policy.get_delay(attempt, r)
+                r.close()
 
-        When you find that a public API only supports a 1-at-a-time approach, and your
-        code needs to request thousands of items, the sendBatchRequests() method is the one to use.
+            sleep(delay)
+            attempt += 1
 
-        >>> # Request info for 3 locations.
-        >>> # Single-request URL is GET /Publish/v2/GetLocationData?LocationIdentifer=loc1
-        >>> # Operation name is "LocationDataServiceRequest"
-        >>> requests = [{'LocationIdentifier': 'Loc1'}, {'LocationIdentifier': 'Loc2'}, {'LocationIdentifier': 'Loc3'}]
-        >>> responses = client.publish.send_batch_requests("/GetLocationData", requests)
-        :param route_or_operation_name: A parameterized route, like "/locations/{uniqueid}", or the name of operation from the AQTS Metadata page, to perform multiple times.
-        :param requests: A list of individual request objects
-        :param batch_size: Optional batch size (defaults to 100 requests per batch)
-        :param verb: Optional HTTP verb of the operation (defaults to "GET")
-        :return: A list of all the responses.
-        """
-        operation_name = self._get_operation_name(route_or_operation_name, verb)
 
-        url = f"/json/reply/{operation_name}[]"
+class OperationMetadataCache:
+    """
+    A persistent on-disk cache of the route-to-operation maps of ServiceStack endpoints.
 
-        # Split the list into batches
-        batched_requests = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+    Each endpoint's map is stored in its own JSON file, along with the server version it was built from.
+    A map built from any other server version is ignored, so a server upgrade automatically refreshes the cache.
 
-        # Get the response batches
-        batched_responses = [self.post(url, json=batch, headers={'X-Http-Method-Override': verb}) for batch in batched_requests]
+    >>> client = timeseries_client('localhost', 'admin', 'admin', metadata_cache_dir='/var/cache/aqts')
+    """
 
-        # Return the flattened response list
-        return [response for batch in batched_responses for response in batch]
+    def __init__(self, directory):
+        self.directory = directory
 
-    def _get_operation_name(self, url, verb='GET'):
-        if self.metadata is None:
-            # Only fetch this once per session
-            self.metadata = {route['operation']: route['name'] for route in [
-                item for sublist in [self._get_operation_routes(operation) for operation in
-                                     self.get('/types/metadata')['Operations']] for item in sublist]}
+    def _path(self, base_url):
+        endpoint_hash = hashlib.sha1(base_url.lower().encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'operations-{endpoint_hash}.json')
 
-        target_route = self._normalize_operation(verb, url)
+    def load(self, base_url, server_version):
+        """Loads the cached operation map of the endpoint, or None if no map exists for this server version"""
+        try:
+            with open(self._path(base_url), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
 
-        if target_route in self.metadata:
-            return self.metadata[target_route]
+        if cached.get('BaseUrl') != base_url or cached.get('ServerVersion') != str(server_version):
+            return None
 
-        return url
+        return cached.get('Operations')
 
-    def _get_operation_routes(self, operation):
-        # ServiceStack 5.xx: metadata['Operations'][i]['Routes'][i]['Path']
-        # ServiceStack 4.xx: metadata['Operations'][i]['Request']['Routes'][i]['Path']
-        routes = operation['Routes'] if 'Routes' in operation else operation['Request']['Routes']
+    def save(self, base_url, server_version, operations):
+        """Saves the operation map of the endpoint, replacing any map from a previous server version"""
+        os.makedirs(self.directory, exist_ok=True)
 
-        return [dict(
-            operation=self._normalize_operation(route['Verbs'], route['Path']),
-            name=operation['Request']['Name'])
-            for route in routes]
+        path = self._path(base_url)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
 
-    def _normalize_operation(self, verb, url):
-        return f"{verb.lower()}/{self._normalize_url(url)}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'BaseUrl': base_url, 'ServerVersion': str(server_version), 'Operations': operations}, f)
 
-    def _normalize_url(self, url):
-        # Fold any /{path}/ parameters into /{}/ so any parameter name will match
-        # Then lowercase it and strip any trailing slash
-        return re.sub('{[^}]+}', '{}', url).rstrip('/').lower()
+        # Atomically replace the file, so concurrent processes never read a partially written map
+        os.replace(temp_path, path)
 
-    def toJSV(self, item):
-        """
-        Converts non-scalar GET request parameters into JSV format.
 
-        Lists must be comma separated
-        Dictionaries must be in {Name1:Value1,Name2:Value2} format
+class SessionTokenCache:
+    """
+    A file-based cache of authenticated session tokens, shared by all the processes on a host.
 
-        https://github.com/ServiceStack/ServiceStack.Text/wiki/JSV-Format
-        :param item: item to be converted into JSV format
-        :return: the JSV representation of the item
-        """
-        if isinstance(item, list):
-            # Concatenate all values with commas
-            return '[' + ','.join([str(self.toJSV(i)) for i in item]) + ']'
+    Tokens are keyed by a hash of the server endpoint and the credentials, so no passwords are stored.
+    The cache file is locked while a token is read or created, so a fan-out of processes starting
+    together will only authenticate once.
 
-        if isinstance(item, dict):
-            # Concatenate all the name/value pairs
-            return '{' + ','.join([k+':'+str(self.toJSV(item[k])) for k in item.keys()]) + '}'
+    >>> client = timeseries_client('localhost', 'admin', 'admin', token_cache='/var/cache/aqts/tokens.json')
+    """
 
-        return item
+    def __init__(self, path):
+        self.path = path
 
+    @staticmethod
+    def create_key(base_url, username, password):
+        return hashlib.sha256(f'{base_url.lower()}\n{username}\n{password}'.encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def locked(self):
+        """Holds an exclusive lock on the cache, across all processes"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        with open(f'{self.path}.lock', 'a+') as lock_file:
+            if os.name == 'nt':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
 
-class TimeSeriesSession(ServiceStackSession):
-    """
-    A requests.Session object for AQUARIUS TimeSeries REST services.
-    """
+            try:
+                yield self
+            finally:
+                if os.name == 'nt':
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-    def __init__(self, hostname, root_path, verify=True):
-        super().__init__(hostname=hostname, root_path=root_path, verify=verify)
+    def _write(self, tokens):
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
 
-    def set_session_token(self, token):
-        self.headers.update({"X-Authentication-Token": token})
+        # Session tokens are credentials, so keep the file private to the current user
+        with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+            json.dump(tokens, f)
 
+        os.replace(temp_path, self.path)
 
-class SingleMetadataResolver:
-    """
-    Resolves the one metadata item from a sorted list of time-ranged metadata items.
+    def get(self, key):
+        """Gets the cached token, or None. Call this while holding the lock."""
+        return self._read().get(key)
 
-    Each item in the list must have a 'StartTime' (inclusive) and 'EndTime' (exclusive) property.
+    def set(self, key, token):
+        """Caches the token. Call this while holding the lock."""
+        tokens = self._read()
+        tokens[key] = token
+        self._write(tokens)
+
+
+class ResponseCache:
     """
+    A two-tier cache of GET response bodies: a memory LRU tier, backed by an optional size-bounded on-disk tier.
 
-    def __init__(self, items):
-        self.items = items
-        self.index = 0
-        self.active = self.items[self.index]
-        self.index += 1
+    A response is cached when the server sends an ETag or Last-Modified validator, or when its route has a TTL.
+    Within its route's TTL, a cached response is returned without any request. After that, a response with validators
+    is revalidated by a conditional request, and a 304 Not Modified reply re-uses the cached body.
+    A response without validators is simply fetched again once its TTL expires.
 
-    def resolve(self, timestamp):
-        while True:
-            if timestamp < self.active['EndTime']:
-                return self.active
-            elif self.index < len(self.items) - 1:
-                self.index += 1
-                self.active = self.items[self.index]
-            else:
-                return None
+    The counters show how many 'hits' needed no request, how many responses were 'revalidated' by a 304 reply,
+    how many 'misses' downloaded a full response, and the total 'bytes_saved' by not downloading cached bodies.
+
+    Responses larger than max_entry_bytes are never cached, so that large point payloads with an ETag
+    (like a full /GetTimeSeriesCorrectedData series) don't evict every other response or fill the disk tier.
+
+    >>> cache = ResponseCache(directory='/var/cache/aqts/responses', route_ttls={'/GetParameterList': timedelta(hours=4)})
+    >>> client = timeseries_client('localhost', 'admin', 'admin', response_cache=cache)
+    >>> parameters = client.publish.get('/GetParameterList')['Parameters']
+    >>> print(cache.counters)
+    """
+
+    DEFAULT_ROUTE_TTLS = {
+        '/GetParameterList': timedelta(hours=1),
+        '/GetUnitList': timedelta(hours=1),
+        '/GetLocationDescriptionList': timedelta(minutes=5),
+        '/GetRatingModelDescriptionList': timedelta(minutes=5),
+    }
+
+    def __init__(self, max_memory_bytes=64 * 1024 * 1024, directory=None, max_disk_bytes=512 * 1024 * 1024, route_ttls=None,
+                 max_entry_bytes=4 * 1024 * 1024):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.route_ttls = route_ttls if route_ttls is not None else dict(self.DEFAULT_ROUTE_TTLS)
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_saved': 0}
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_key(url, params, partition):
+        """Creates the cache key of a GET request. The partition keeps the responses seen by different users apart."""
+        # Encode the params exactly like requests does, so only requests with the same query string share a key
+        query = RequestEncodingMixin._encode_params(params) if params else ''
+
+        if isinstance(query, str):
+            query = query.encode('utf-8')
+
+        return hashlib.sha256(f'{url}\n'.encode('utf-8') + query + f'\n{partition}'.encode('utf-8')).hexdigest()
+
+    def get(self, session, url, **kwargs):
+        """
+        Gets the body of a GET request, from the cache when possible.
+
+        :param session: The RestSession sending any request
+        :param url: The route of the request
+        :return: The response body bytes
+        """
+        key = self.create_key(session.base_url + url, kwargs.get('params'), session.cache_partition)
+        entry = self._load(key)
+        now = datetime.now(timezone.utc).timestamp()
+
+        if entry is not None and now < entry['Expires']:
+            self._count(hits=1, bytes_saved=len(entry['Body']))
+            return entry['Body']
+
+        headers = dict(kwargs.pop('headers', None) or {})
+
+        if entry is not None:
+            if entry.get('ETag'):
+                headers['If-None-Match'] = entry['ETag']
+            if entry.get('LastModified'):
+                headers['If-Modified-Since'] = entry['LastModified']
+
+        response = session._get_raw(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self._count(revalidated=1, bytes_saved=len(entry['Body']))
+            self._store(key, {**entry, 'Expires': now + self._ttl_seconds(url)})
+            return entry['Body']
+
+        self._count(misses=1)
+
+        entry = {
+            'Body': response.content,
+            'ETag': response.headers.get('ETag'),
+            'LastModified': response.headers.get('Last-Modified'),
+            'Expires': now + self._ttl_seconds(url)}
+
+        if response.status_code == 200 and (entry['ETag'] or entry['LastModified'] or url in self.route_ttls):
+            self._store(key, entry)
+
+        return entry['Body']
+
+    def _ttl_seconds(self, url):
+        ttl = self.route_ttls.get(url)
+        return ttl.total_seconds() if ttl is not None else 0
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, increment in increments.items():
+                self.counters[name] += increment
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._load_from_disk(key)
+
+        if entry is not None:
+            self._store_in_memory(key, entry)
+
+        return entry
+
+    def _store(self, key, entry):
+        if len(entry['Body']) > self.max_entry_bytes:
+            # Don't keep serving an older copy which was small enough to cache
+            self._remove(key)
+            return
+
+        self._store_in_memory(key, entry)
+        self._store_on_disk(key, entry)
+
+    def _remove(self, key):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous['Body'])
+
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _store_in_memory(self, key, entry):
+        size = len(entry['Body'])
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous['Body'])
+
+            if size > self.max_memory_bytes:
+                return
+
+            self._entries[key] = entry
+            self._memory_bytes += size
+
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= len(evicted['Body'])
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.response')
+
+    def _load_from_disk(self, key):
+        if self.directory is None:
+            return None
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                header = json.loads(f.readline())
+                body = f.read()
+
+            # Keep the access time current, for the least-recently-used pruning
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            return None
+
+        return {**header, 'Body': body}
+
+    def _store_on_disk(self, key, entry):
+        if self.directory is None or len(entry['Body']) > self.max_disk_bytes:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        header = {name: value for name, value in entry.items() if name != 'Body'}
+
+        with open(temp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            f.write(entry['Body'])
+
+        # Atomically replace the file, so concurrent processes never read a partially written response
+        os.replace(temp_path, path)
+
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Removes the least recently used responses, until the on-disk tier fits in max_disk_bytes"""
+        files = []
+
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.response'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, filename))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, filename))
+
+        total = sum(size for _, size, _ in files)
+
+        for _, size, filename in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass
+
+            total -= size
+
+    def clear(self):
+        """Removes every cached response, from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+        if self.directory is not None and os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.response'):
+                    os.remove(os.path.join(self.directory, filename))
+
+
+class IdentifierCache:
+    """
+    A thread-safe in-memory cache of identifier to UniqueId lookups, with LRU eviction and a time-to-live.
+
+    Location entries are keyed by location identifier, and time-series entries by 'Parameter.Label@Location' identifier.
+    A single GetTimeSeriesDescriptionList response fills the entries of every time-series at its location.
+
+    The client drops the entries of any location or time-series it deletes. Call invalidate(), invalidate_location()
+    or clear() after renaming or deleting things through any other client.
+
+    >>> client = timeseries_client('localhost', 'admin', 'admin', identifier_cache=IdentifierCache(ttl=timedelta(hours=1)))
+    >>> client.identifier_cache.invalidate_location('Loc1')
+    """
+
+    def __init__(self, max_size=100000, ttl=timedelta(minutes=10)):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def location_key(location_identifier):
+        return 'location', location_identifier
+
+    @staticmethod
+    def time_series_key(time_series_identifier):
+        return 'timeseries', time_series_identifier
+
+    def get(self, key):
+        """Gets the cached UniqueId, or None when the entry is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] <= perf_counter():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+
+            return entry[0]
+
+    def put(self, key, unique_id):
+        self.put_many({key: unique_id})
+
+    def put_many(self, unique_ids):
+        """Caches many UniqueIds at once, from a dictionary of keys to UniqueIds"""
+        if self.max_size <= 0:
+            return
+
+        expires = perf_counter() + self.ttl.total_seconds()
+
+        with self._lock:
+            for key, unique_id in unique_ids.items():
+                self._entries[key] = (unique_id, expires)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def invalidate(self, key):
+        """Drops one cached entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_location(self, location_identifier):
+        """Drops the cached entries of a location, and of every time-series at the location"""
+        suffix = f'@{location_identifier}'
+
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key == self.location_key(location_identifier)
+                        or key[0] == 'timeseries' and key[1].endswith(suffix)]:
+                del self._entries[key]
+
+    def invalidate_unique_id(self, unique_id):
+        """Drops every cached entry resolving to the UniqueId"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] == unique_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ServiceStackSession(RestSession):
+    """
+    A requests.Session object for ServiceStack-based REST services.
+
+    AQUARIUS TimeSeries and AQUARIUS WebPortal both use ServiceStack back-ends
+    """
+
+    def __init__(self, hostname, root_path, verify=True, transport=None, retry_policy=None):
+        super().__init__(hostname=hostname, root_path=root_path, verify=verify, transport=transport, retry_policy=retry_policy)
+        self.metadata = None
+        self.metadata_cache = None
+        # The server version (or a callable returning it) which keys the metadata cache
+        self.server_version = None
+        self.batch_timings = []
+        self.batch_sizes = {}
+
+    def send_batch_requests(self, route_or_operation_name, requests, batch_size=100, verb="GET", max_concurrency=1, timings=None):
+        """
+        Performs a batch of identical operations
+
+        This method is useful for requesting large amounts of similar data from AQTS,
+        taking advantage of ServiceStack's support for auto-batched requests.
+
+        http://docs.servicestack.net/auto-batched-requests
+
+        When you find that a public API only supports a 1-at-a-time approach, and your
+        code needs to request thousands of items, the sendBatchRequests() method is the one to use.
+
+        >>> # Request info for 3 locations.
+        >>> # Single-request URL is GET /Publish/v2/GetLocationData?LocationIdentifer=loc1
+        >>> # Operation name is "LocationDataServiceRequest"
+        >>> requests = [{'LocationIdentifier': 'Loc1'}, {'LocationIdentifier': 'Loc2'}, {'LocationIdentifier': 'Loc3'}]
+        >>> responses = client.publish.send_batch_requests("/GetLocationData", requests)
+
+        The elapsed time of each batch is recorded in the timings list, to help tune the batch_size and max_concurrency values.
+        The batch_timings list of the session also holds the timings of the most recently completed call,
+        but pass your own timings list when other threads or coroutines might send batch requests with the same session.
+
+        >>> timings = []
+        >>> responses = client.provisioning.send_batch_requests('/locations/{Id}', requests, max_concurrency=4, timings=timings)
+        >>> slowest = max(timings, key=lambda timing: timing['seconds'])
+
+        Set batch_size='auto' (or to an AdaptiveBatchSize object) to let the batch size adapt to the measured latency and
+        response size of each batch. Any batch rejected by the server as too big is split in half and retried.
+        A batch which timed out or failed at a gateway is only split and retried for idempotent verbs, since the server
+        may have already performed some of it.
+        The settled size of each operation is kept in the batch_sizes dictionary, which can be saved and restored for later runs.
+
+        >>> responses = client.publish.send_batch_requests('/GetLocationData', requests, batch_size='auto')
+        >>> saved_sizes = dict(client.publish.batch_sizes)
+        >>> # Then in a later run ...
+        >>> client.publish.batch_sizes.update(saved_sizes)
+
+        Use iter_batch_requests() instead to stream the responses of very large request sets with bounded memory.
+        :param route_or_operation_name: A parameterized route, like "/locations/{uniqueid}", or the name of operation from the AQTS Metadata page, to perform multiple times.
+        :param requests: An iterable of individual request objects
+        :param batch_size: Optional batch size (defaults to 100 requests per batch), or 'auto' or an AdaptiveBatchSize object for adaptive batches
+        :param verb: Optional HTTP verb of the operation (defaults to "GET")
+        :param max_concurrency: Optional number of batches to keep in flight at once (defaults to 1 batch at a time)
+        :param timings: Optional list which receives the timing of each batch of this call, in batch order
+        :return: A list of all the responses, in the same order as the requests.
+        """
+        if timings is None:
+            timings = []
+
+        responses = list(self.iter_batch_requests(route_or_operation_name, requests, batch_size, verb, max_concurrency, timings))
+
+        timings.sort(key=lambda timing: timing['batch'])
+        self.batch_timings = timings
+
+        return responses
+
+    def iter_batch_requests(self, route_or_operation_name, requests, batch_size=100, verb="GET", max_concurrency=1, timings=None):
+        """
+        Performs a batch of identical operations, yielding each response as soon as its batch completes.
+
+        This is the streaming form of send_batch_requests(). The requests can be any iterable, including a lazy generator,
+        and only max_concurrency batches of requests and responses are held in memory at any time.
+
+        >>> requests = ({'LocationUniqueId': loc['UniqueId']} for loc in client.getLocationDescriptionList())
+        >>> for location in client.provisioning.iter_batch_requests('/locations/{Id}', requests, max_concurrency=4):
+        ...   print(location['Identifier'])
+        :param route_or_operation_name: A parameterized route, like "/locations/{uniqueid}", or the name of operation from the AQTS Metadata page, to perform multiple times.
+        :param requests: An iterable of individual request objects
+        :param batch_size: Optional batch size (defaults to 100 requests per batch), or 'auto' or an AdaptiveBatchSize object for adaptive batches
+        :param verb: Optional HTTP verb of the operation (defaults to "GET")
+        :param max_concurrency: Optional number of batches to keep in flight at once (defaults to 1 batch at a time)
+        :param timings: Optional list which receives the timing of each batch of this call, as each batch completes
+        :return: A generator of all the responses, in the same order as the requests.
+        """
+        operation_name = self._get_operation_name(route_or_operation_name, verb)
+
+        url = f"/json/reply/{operation_name}[]"
+
+        if batch_size == 'auto':
+            batch_size = AdaptiveBatchSize(initial_size=self.batch_sizes.get(operation_name, 100))
+
+        adaptive = isinstance(batch_size, AdaptiveBatchSize)
+
+        def send_batch(indexed_batch):
+            index, batch = indexed_batch
+            started = perf_counter()
+
+            try:
+                response = self._post_raw(url, json=batch, headers={'X-Http-Method-Override': verb})
+            except requests_exceptions.RequestException as e:
+                if not adaptive or len(batch) < 2 or not self._can_split_failed_batch(e, verb):
+                    raise
+
+                # Split the rejected batch and retry both halves.
+                # Only a Request Timeout or Payload Too Large response says the batch itself was too big.
+                status_code = e.response.status_code if e.response is not None else None
+                batch_size.record_failure(len(batch), too_big=status_code in [408, 413])
+                self.batch_sizes[operation_name] = batch_size.size
+                half = len(batch) // 2
+
+                return send_batch((index, batch[:half])) + send_batch((index, batch[half:]))
+
+            seconds = perf_counter() - started
+            if timings is not None:
+                timings.append({'batch': index, 'size': len(batch), 'seconds': seconds, 'bytes': len(response.content)})
+
+            if adaptive:
+                batch_size.record_success(len(batch), seconds, len(response.content))
+                self.batch_sizes[operation_name] = batch_size.size
+
+            return self.json_or_none(response)
+
+        # Lazily split the requests into batches, and yield the responses in request order
+        for responses in ordered_concurrent_map(send_batch, enumerate(batches(requests, batch_size)), max_concurrency):
+            yield from responses
+
+    @staticmethod
+    def _can_split_failed_batch(error, verb):
+        status_code = error.response.status_code if error.response is not None else None
+
+        if status_code == 413:
+            # Payload Too Large: the server rejected the batch without performing any of it
+            return True
+
+        if verb.upper() not in RetryPolicy.idempotent_verbs:
+            # The server may have already performed a batch which failed, so resending it could duplicate its work
+            return False
+
+        if isinstance(error, (requests_exceptions.Timeout, requests_exceptions.ConnectionError)):
+            return True
+
+        # Request Timeout, Bad Gateway, or Gateway Timeout
+        return status_code in [408, 502, 504]
+
+    def _get_operation_name(self, url, verb='GET'):
+        if self.metadata is None:
+            # Only fetch this once per session
+            self.metadata = self._load_operation_metadata()
+
+        target_route = self._normalize_operation(verb, url)
+
+        if target_route in self.metadata:
+            return self.metadata[target_route]
+
+        return url
+
+    def _load_operation_metadata(self):
+        server_version = self.server_version() if callable(self.server_version) else self.server_version
+        use_cache = self.metadata_cache is not None and server_version is not None
+
+        if use_cache:
+            metadata = self.metadata_cache.load(self.base_url, server_version)
+
+            if metadata is not None:
+                return metadata
+
+        metadata = {route['operation']: route['name'] for route in [
+            item for sublist in [self._get_operation_routes(operation) for operation in
+                                 self.get('/types/metadata')['Operations']] for item in sublist]}
+
+        if use_cache:
+            self.metadata_cache.save(self.base_url, server_version, metadata)
+
+        return metadata
+
+    def _get_operation_routes(self, operation):
+        # ServiceStack 5.xx: metadata['Operations'][i]['Routes'][i]['Path']
+        # ServiceStack 4.xx: metadata['Operations'][i]['Request']['Routes'][i]['Path']
+        routes = operation['Routes'] if 'Routes' in operation else operation['Request']['Routes']
+
+        return [dict(
+            operation=self._normalize_operation(route['Verbs'], route['Path']),
+            name=operation['Request']['Name'])
+            for route in routes]
+
+    def _normalize_operation(self, verb, url):
+        return f"{verb.lower()}/{self._normalize_url(url)}"
+
+    def _normalize_url(self, url):
+        # Fold any /{path}/ parameters into /{}/ so any parameter name will match
+        # Then lowercase it and strip any trailing slash
+        return re.sub('{[^}]+}', '{}', url).rstrip('/').lower()
+
+    def toJSV(self, item):
+        """
+        Converts non-scalar GET request parameters into JSV format.
+
+        Lists must be comma separated
+        Dictionaries must be in {Name1:Value1,Name2:Value2} format
+
+        https://github.com/ServiceStack/ServiceStack.Text/wiki/JSV-Format
+        :param item: item to be converted into JSV format
+        :return: the JSV representation of the item
+        """
+        if isinstance(item, list):
+            # Concatenate all values with commas
+            return '[' + ','.join([str(self.toJSV(i)) for i in item]) + ']'
+
+        if isinstance(item, dict):
+            # Concatenate all the name/value pairs
+            return '{' + ','.join([k+':'+str(self.toJSV(item[k])) for k in item.keys()]) + '}'
+
+        return item
+
+
+class TimeSeriesSession(ServiceStackSession):
+    """
+    A requests.Session object for AQUARIUS TimeSeries REST services.
+    """
+
+    def __init__(self, hostname, root_path, verify=True, transport=None, retry_policy=None):
+        super().__init__(hostname=hostname, root_path=root_path, verify=verify, transport=transport, retry_policy=retry_policy)
+
+    def set_session_token(self, token):
+        self.headers.update({"X-Authentication-Token": token})
+
+
+class SingleMetadataResolver:
+    """
+    Resolves the one metadata item from a sorted list of time-ranged metadata items.
+
+    Each item in the list must have a 'StartTime' (inclusive) and 'EndTime' (exclusive) property.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.index = 0
+
+    def resolve(self, timestamp):
+        while self.index < len(self.items):
+            active = self.items[self.index]
+            if timestamp < active['EndTime']:
+                return active if active['StartTime'] <= timestamp else None
+            self.index += 1
+
+        return None
 
 
 class OverlappingMetadataResolver:
     """
     Resolves all the applicable items from a sorted list of time-ranged metadata items.
 
-    Each item in the list must have a 'StartTime' (inclusive) and 'EndTime' (exclusive) property.
-    """
+    Each item in the list must have a 'StartTime' (inclusive) and 'EndTime' (exclusive) property.
+
+    Items become active in list order as their StartTime is reached, and a heap of the active items' EndTime values
+    retires each one exactly once, so resolving n ascending timestamps over k items costs O((n + k) log k),
+    plus the size of the results.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.index = 0
+        # The active items, keyed by their list index. Dictionaries keep their insertion (list) order.
+        self.actives = {}
+        self.endings = []
+        self.latest = None
+
+    def resolve(self, timestamp):
+        # Remove all items from the active list which are now stale
+        while self.endings and self.endings[0][0] <= timestamp:
+            _, index = heapq.heappop(self.endings)
+            del self.actives[index]
+
+        # Add any new items that have just started
+        is_filter_needed = self.latest is not None and timestamp < self.latest
+        while self.index < len(self.items) and self.items[self.index]['StartTime'] <= timestamp:
+            item = self.items[self.index]
+            self.actives[self.index] = item
+            heapq.heappush(self.endings, (item['EndTime'], self.index))
+            is_filter_needed = is_filter_needed or item['EndTime'] <= timestamp
+            self.index += 1
+
+        self.latest = timestamp if self.latest is None else max(self.latest, timestamp)
+
+        if not is_filter_needed:
+            # Every active item has started and not yet ended
+            return list(self.actives.values())
+
+        return [item for item in self.actives.values() if item['StartTime'] <= timestamp < item['EndTime']]
+
+    def resolve_all(self, timestamps):
+        """Resolves the applicable items for each of the ascending timestamps, as a list of lists"""
+        return [self.resolve(timestamp) for timestamp in timestamps]
+
+
+def _datetime64_from_timestamps(timestamps):
+    """
+    Parses AQTS timestamps into arrays of UTC times and UTC offsets, without any per-timestamp Python code.
+
+    Every AQTS timestamp has the same layout, like '2011-01-01T00:00:00.0000000-08:00' or '2011-01-01T00:00:00Z',
+    so the digits of every field can be read straight from fixed columns of a NumPy character array.
+    The quirky 'T24:00:00' end-of-day timestamps need no special treatment, since the hours are simply added to the date.
+
+    :param timestamps: A list or array of ISO 8601 timestamp strings
+    :return: A tuple of the datetime64[us] UTC times, and the timedelta64[m] UTC offsets
+    :raises ValueError: When any timestamp is not in the fixed-width layout, or has an out-of-range field
+    """
+    layout_error = 'Timestamps must be in ISO 8601 yyyy-MM-ddTHH:mm:ss[.fffffff](Z|+HH:mm) format'
+    text = np.asarray(timestamps, dtype=str)
+    count = len(text)
+
+    if count == 0:
+        return np.array([], dtype='datetime64[us]'), np.array([], dtype='timedelta64[m]')
+
+    # A view of the UTF-32 code points of every character, without any copying
+    chars = text.view(np.uint32).reshape(count, -1)
+    width = chars.shape[1]
+    lengths = np.char.str_len(text)
+    rows = np.arange(count)
+
+    if width < 20 or np.any(lengths < 20) or any(np.any(chars[:, i] != ord(c)) for i, c in zip((4, 7, 10, 13, 16), '--T::')):
+        raise ValueError(layout_error)
+
+    def is_digit(values):
+        # Code points below '0' wrap around to huge unsigned values
+        return (values - ord('0')) <= 9
+
+    def number(column, size):
+        value = np.zeros(count, dtype=np.int64)
+        for i in range(column, column + size):
+            value = value * 10 + (chars[:, i].astype(np.int64) - ord('0'))
+        return value
+
+    is_utc = chars[rows, lengths - 1] == ord('Z')
+    offset_start = np.where(is_utc, lengths - 1, lengths - 6)
+    has_fraction = chars[:, 19] == ord('.')
+
+    # The 6 characters of every '+HH:mm' offset. A 'Z' offset reads a few characters of padding, which are ignored.
+    offset_chars = chars[rows[:, np.newaxis], np.minimum(offset_start[:, np.newaxis] + np.arange(6), width - 1)]
+    fraction_columns = np.arange(20, width)
+
+    # Check every character which isn't a fixed separator, before any arithmetic on the digits
+    is_valid = np.all(is_digit(chars[:, :19]) | np.isin(np.arange(19), (4, 7, 10, 13, 16)))
+    is_valid &= np.all(np.where(has_fraction, offset_start > 20, offset_start == 19))
+    is_valid &= np.all(is_digit(chars[:, 20:]) | ~has_fraction[:, np.newaxis] | (fraction_columns >= offset_start[:, np.newaxis]))
+    is_valid &= np.all(is_utc | (((offset_chars[:, 0] == ord('+')) | (offset_chars[:, 0] == ord('-')))
+                                 & np.all(is_digit(offset_chars[:, [1, 2, 4, 5]]), axis=1) & (offset_chars[:, 3] == ord(':'))))
+
+    if not is_valid:
+        raise ValueError(layout_error)
+
+    # Up to 6 digits of fractional seconds. Any 7th digit (AQTS uses 100ns ticks) is truncated.
+    microseconds = np.zeros(count, dtype=np.int64)
+    for column in range(20, 26):
+        present = has_fraction & (column < offset_start)
+        digits = chars[:, column].astype(np.int64) - ord('0') if column < width else 0
+        microseconds = microseconds * 10 + np.where(present, digits, 0)
+
+    offset_digits = offset_chars.astype(np.int64) - ord('0')
+    offset_sign = np.where(offset_chars[:, 0] == ord('-'), -1, 1)
+    offset_hours = np.where(is_utc, 0, offset_digits[:, 1] * 10 + offset_digits[:, 2])
+    offset_minutes = np.where(is_utc, 0, offset_digits[:, 4] * 10 + offset_digits[:, 5])
+
+    month, day, hour, minute, second = number(5, 2), number(8, 2), number(11, 2), number(14, 2), number(17, 2)
+
+    months = (number(0, 4) - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1).astype('timedelta64[M]')
+    days = months.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+
+    # The only valid hour 24 is the 'T24:00:00' end of the day
+    is_valid = (month >= 1) & (month <= 12) & (day >= 1) & (days.astype('datetime64[M]') == months) \
+        & ((hour < 24) | ((hour == 24) & (minute == 0) & (second == 0) & (microseconds == 0))) \
+        & (minute < 60) & (second < 60) & (offset_hours < 24) & (offset_minutes < 60)
+
+    if not np.all(is_valid):
+        raise ValueError('Timestamps must have valid dates, times and UTC offsets')
+
+    offset_minutes = offset_sign * (offset_hours * 60 + offset_minutes)
+    seconds = (hour * 60 + minute) * 60 + second
+    local_times = days.astype('datetime64[us]') + (seconds * 1000000 + microseconds).astype('timedelta64[us]')
+    offsets = offset_minutes.astype('timedelta64[m]')
+
+    return local_times - offsets, offsets
+
+
+_EPOCH = datetime(1970, 1, 1)
+_timezones = {'Z': timezone.utc}
+
+
+def _timezone_from_offset(offset):
+    """Gets the memoized tzinfo of a '+HH:MM', '-HH:MM' or 'Z' UTC offset"""
+    tz = _timezones.get(offset)
+
+    if tz is None:
+        sign = -1 if offset[0] == '-' else 1
+        tz = _timezones.setdefault(offset, timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))))
+
+    return tz
+
+
+def _parse_timestamp(text):
+    """Parses one ISO 8601 timestamp, using the fixed-width AQTS layout when possible"""
+    if text[10:19] == "T24:00:00":
+        # Deal with the quirky end-of-day timestamps from the AQTS Publish API
+        # Parse a normalized version and add a day
+        return _parse_timestamp(text[:11] + "00" + text[13:]) + timedelta(days=1)
+
+    offset = 'Z' if text[-1:] == 'Z' else text[-6:]
+    fraction = text[19:len(text) - len(offset)]
+
+    if len(text) >= 20 and (offset == 'Z' or offset[0] in '+-' and offset[3] == ':') and fraction[:1] in ('', '.'):
+        try:
+            # Before Python 3.11, datetime.fromisoformat() needs exactly 6 digits of fractional seconds, and no 'Z'
+            microseconds = (fraction[1:7] + '000000')[:6]
+            return datetime.fromisoformat(text[:19] + '.' + microseconds + ('+00:00' if offset == 'Z' else offset))
+        except ValueError:
+            pass
+
+    return pyrfc3339.parse(text)
+
+
+def parse_timestamps(timestamps, as_datetime64=False):
+    """
+    Parses many ISO 8601 timestamps at once, much faster than calling timeseries_client.datetime() for each one.
+
+    Every AQTS timestamp has the same fixed-width layout, so when numpy is installed, all the timestamps are parsed
+    as arrays, and the datetimes share one memoized tzinfo object for each distinct UTC offset.
+    The quirky 'T24:00:00' end-of-day timestamps are parsed as midnight of the following day.
+
+    >>> times = parse_timestamps([point['Timestamp'] for point in response['Points']])
+
+    :param timestamps: A list or array of ISO 8601 timestamp strings
+    :param as_datetime64: When True, returns a numpy datetime64[us] array of the UTC times instead. Requires numpy.
+    :return: A list of timezone-aware datetime objects, or a datetime64[us] array
+    """
+    if np is None:
+        if as_datetime64:
+            raise ImportError('parse_timestamps(as_datetime64=True) requires the numpy package. Install it via: $ pip install numpy')
+
+        return [_parse_timestamp(text) for text in timestamps]
+
+    try:
+        times, offsets = _datetime64_from_timestamps(timestamps)
+    except ValueError:
+        if as_datetime64:
+            raise
+
+        # Some timestamps are not in the fixed-width AQTS layout, so parse each one on its own
+        return [_parse_timestamp(text) for text in timestamps]
+
+    if as_datetime64:
+        return times
+
+    local_times = times + offsets
+    datetimes = np.empty(len(times), dtype=object)
+
+    for offset in np.unique(offsets):
+        minutes = int(offset.astype(np.int64))
+        tz = _timezone_from_offset('Z' if minutes == 0 else f'{"-" if minutes < 0 else "+"}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}')
+        selected = offsets == offset
+
+        # Adding timedelta objects to an aware datetime keeps its tzinfo object
+        datetimes[selected] = (local_times[selected] - np.datetime64(_EPOCH, 'us')).astype(object) + _EPOCH.replace(tzinfo=tz)
+
+    return datetimes.tolist()
+
+
+def time_windows(start, end, count):
+    """
+    Splits a time range into count equal windows.
+
+    Adjacent windows share their boundary time, so a point exactly on a boundary can be returned by both windows.
+
+    :param start: The start of the range, as a datetime or ISO 8601 text
+    :param end: The end of the range, as a datetime or ISO 8601 text
+    :param count: The number of windows
+    :return: A list of (start, end) datetime tuples
+    """
+    if isinstance(start, str):
+        start = _parse_timestamp(start)
+    if isinstance(end, str):
+        end = _parse_timestamp(end)
+
+    step = (end - start) / count
+    boundaries = [start + step * i for i in range(count)] + [end]
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _metadata_identity(item):
+    """Gets a hashable identity of a time-ranged metadata item, ignoring its time range"""
+    return json.dumps({key: value for key, value in item.items() if key not in ('StartTime', 'EndTime')}, sort_keys=True, default=str)
+
+
+def _merge_metadata_periods(items):
+    """
+    Merges duplicated copies of time-ranged metadata items, like the ones returned by adjacent query windows.
+
+    Items which are identical apart from their time range, and whose time ranges overlap or touch, become one item
+    spanning the union of their time ranges. Items can still overlap items of a different identity, as Qualifiers and Notes do.
+    """
+    groups = {}
+
+    for item in items:
+        groups.setdefault(_metadata_identity(item), []).append(item)
+
+    merged = []
+
+    for group in groups.values():
+        group.sort(key=lambda item: _parse_timestamp(item['StartTime']))
+        current = dict(group[0])
+
+        for item in group[1:]:
+            if _parse_timestamp(item['StartTime']) <= _parse_timestamp(current['EndTime']):
+                if _parse_timestamp(item['EndTime']) > _parse_timestamp(current['EndTime']):
+                    current['EndTime'] = item['EndTime']
+            else:
+                merged.append(current)
+                current = dict(item)
+
+        merged.append(current)
+
+    merged.sort(key=lambda item: (_parse_timestamp(item['StartTime']), _parse_timestamp(item['EndTime'])))
+
+    return merged
+
+
+def _is_time_ranged_list(value):
+    return isinstance(value, list) and all(isinstance(item, dict) and 'StartTime' in item and 'EndTime' in item for item in value)
+
+
+def merge_time_series_windows(responses):
+    """
+    Stitches the GetTimeSeriesCorrectedData responses of consecutive query windows back into one response.
+
+    Points are concatenated in window order, dropping any point already returned by the previous window.
+    Every time-ranged metadata list, like Approvals, Grades, Methods, GapTolerances, InterpolationTypes,
+    Qualifiers and Notes, is merged without duplicating the periods which span a window boundary.
+    All the other properties come from the first response.
+
+    :param responses: The responses, in time order
+    :return: The merged response
+    """
+    merged = dict(responses[0])
+
+    points = []
+    latest = None
+
+    for response in responses:
+        window_points = response.get('Points', [])
+
+        if latest is not None:
+            # Skip past any points on or before the end of the previous window
+            skip = 0
+            while skip < len(window_points) and _parse_timestamp(window_points[skip]['Timestamp']) <= latest:
+                skip += 1
+            window_points = window_points[skip:]
+
+        if window_points:
+            points.extend(window_points)
+            latest = _parse_timestamp(window_points[-1]['Timestamp'])
+
+    merged['Points'] = points
+
+    if 'NumPoints' in merged:
+        merged['NumPoints'] = len(points)
+
+    for key, value in merged.items():
+        if key == 'Points':
+            continue
+
+        if _is_time_ranged_list(value) and all(_is_time_ranged_list(response.get(key, [])) for response in responses):
+            merged[key] = _merge_metadata_periods([item for response in responses for item in response.get(key, [])])
+
+    if isinstance(merged.get('TimeRange'), dict):
+        ranges = [response['TimeRange'] for response in responses if response.get('TimeRange')]
+        merged['TimeRange'] = {
+            **merged['TimeRange'],
+            'StartTime': min((r['StartTime'] for r in ranges), key=_parse_timestamp),
+            'EndTime': max((r['EndTime'] for r in ranges), key=_parse_timestamp)}
+
+    return merged
+
+
+def _resolve_period_indexes(times, periods):
+    """
+    Finds the index of the time-ranged metadata period which applies at each time, or -1 where no period applies.
+
+    The periods must be sorted and non-overlapping, each with a 'StartTime' (inclusive) and 'EndTime' (exclusive) property.
+    Every time is resolved at once, by a binary search of the period boundaries.
+    """
+    if not periods:
+        return np.full(len(times), -1, dtype=np.int32)
+
+    starts, _ = _datetime64_from_timestamps([period['StartTime'] for period in periods])
+    ends, _ = _datetime64_from_timestamps([period['EndTime'] for period in periods])
+
+    # The first period ending after each time is the only one which could contain it
+    indexes = np.searchsorted(ends, times, side='right')
+    candidates = np.minimum(indexes, len(periods) - 1)
+    applies = (indexes < len(periods)) & (starts[candidates] <= times)
+
+    return np.where(applies, indexes, -1).astype(np.int32)
+
+
+def _resolve_point_ranges(times, periods):
+    """
+    Finds the range of points to which each time-ranged metadata period applies.
+
+    Unlike _resolve_period_indexes(), the periods may overlap, as Qualifiers and Notes do.
+
+    :return: A tuple of the index of the first point of each period, and the index just beyond its last point
+    """
+    if not periods:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    starts, _ = _datetime64_from_timestamps([period['StartTime'] for period in periods])
+    ends, _ = _datetime64_from_timestamps([period['EndTime'] for period in periods])
+
+    firsts = np.searchsorted(times, starts, side='left')
+    stops = np.maximum(np.searchsorted(times, ends, side='left'), firsts)
+
+    return firsts, stops
+
+
+class TimeSeriesPoints:
+    """
+    A columnar copy of the points of a GetTimeSeriesCorrectedData or GetTimeSeriesData response, held in NumPy arrays.
+
+    timestamps      => A datetime64[us] array of the UTC time of each point
+    utc_offset      => The UTC offset of the series, as a timedelta
+    values          => A float64 array of the numeric point values, with NaN for any point without a numeric value.
+                       GetTimeSeriesData responses have one column of values for each requested series.
+    grade_codes     => An integer array of the grade code of each point, with the same shape as values
+    approval_levels => An integer array of the approval level of each point, with the same shape as values
+    metadata        => A dictionary of every other response property, like 'Approvals', 'Grades' or 'TimeSeries'
+
+    Any point without an applicable grade or approval has the MISSING_CODE value.
+
+    Requires the numpy package. The to_pandas() method also requires the pandas package.
+
+    >>> points = client.getTimeSeriesCorrectedDataColumns('Stage.Working@Loc1', queryFrom=..., queryTo=...)
+    >>> daily_means = points.to_pandas()['Value'].resample('1D').mean()
+    """
+
+    MISSING_CODE = -2147483648
+
+    def __init__(self, timestamps, utc_offset, values, grade_codes, approval_levels, metadata):
+        self.timestamps = timestamps
+        self.utc_offset = utc_offset
+        self.values = values
+        self.grade_codes = grade_codes
+        self.approval_levels = approval_levels
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return f'TimeSeriesPoints({len(self)} points, values{self.values.shape})'
+
+    @classmethod
+    def from_response(cls, response):
+        """Creates the columnar points from a complete GetTimeSeriesCorrectedData or GetTimeSeriesData response"""
+        metadata = {key: value for key, value in response.items() if key != 'Points'}
+        return cls._from_chunks([response['Points']], metadata, 'TimeSeries' in metadata)
+
+    @classmethod
+    def from_stream(cls, streamed_response, is_multi_series=False):
+        """
+        Creates the columnar points from a StreamedJsonResponse, one chunk at a time.
+
+        Only one chunk of point dictionaries is ever held in memory.
+
+        :param streamed_response: The StreamedJsonResponse of the points
+        :param is_multi_series: True for GetTimeSeriesData points, or False (the default) for GetTimeSeriesCorrectedData points
+        """
+        with streamed_response:
+            return cls._from_chunks(streamed_response, streamed_response.properties, is_multi_series)
+
+    @classmethod
+    def _from_chunks(cls, chunks, metadata, is_multi_series):
+        if np is None:
+            raise ImportError('TimeSeriesPoints requires the numpy package. Install it via: $ pip install numpy')
+
+        time_chunks = []
+        offset_chunks = []
+        value_chunks = []
+
+        for points in chunks:
+            times, offsets = _datetime64_from_timestamps([point['Timestamp'] for point in points])
+            time_chunks.append(times)
+            offset_chunks.append(offsets)
+            value_chunks.append(cls._extract_values(points, is_multi_series))
+
+        # GetTimeSeriesData responses describe each series in their 'TimeSeries' list,
+        # which is only complete once every chunk has been read, since it may follow the points.
+        series_metadata = metadata.get('TimeSeries', []) if is_multi_series else [metadata]
+        column_count = len(series_metadata)
+
+        if any(chunk.shape[1] > column_count for chunk in value_chunks):
+            raise ValueError(f'The points have more values than the {column_count} series in the response')
+
+        # A series without any value in a chunk gets a column of NaN values there
+        value_chunks = [
+            np.pad(chunk, ((0, 0), (0, column_count - chunk.shape[1])), constant_values=np.nan) for chunk in value_chunks]
+
+        timestamps = np.concatenate(time_chunks) if time_chunks else np.array([], dtype='datetime64[us]')
+        offsets = np.concatenate(offset_chunks) if offset_chunks else np.array([], dtype='timedelta64[m]')
+        values = np.concatenate(value_chunks) if value_chunks else np.empty((0, column_count))
+
+        grade_codes = np.column_stack([
+            cls._resolve_codes(timestamps, series.get('Grades', []), 'GradeCode') for series in series_metadata]
+            or [np.empty((len(timestamps), 0), dtype=np.int32)])
+        approval_levels = np.column_stack([
+            cls._resolve_codes(timestamps, series.get('Approvals', []), 'ApprovalLevel') for series in series_metadata]
+            or [np.empty((len(timestamps), 0), dtype=np.int32)])
+
+        if not is_multi_series:
+            values = values.reshape(-1)
+            grade_codes = grade_codes.reshape(-1)
+            approval_levels = approval_levels.reshape(-1)
+
+        utc_offset = offsets[0].item() if len(offsets) else None
+
+        return cls(timestamps, utc_offset, values, grade_codes, approval_levels, metadata)
+
+    @staticmethod
+    def _extract_values(points, is_multi_series):
+        count = len(points)
+
+        if not is_multi_series:
+            # GetTimeSeriesCorrectedData points: {'Timestamp': ..., 'Value': {'Numeric': ..., 'Display': ...}}
+            if any('Value' not in point for point in points):
+                raise ValueError("GetTimeSeriesCorrectedData points must have a 'Value' property")
+
+            values = np.fromiter(
+                (point['Value'].get('Numeric', np.nan) if point['Value'] else np.nan for point in points),
+                dtype=np.float64, count=count)
+            return values.reshape(count, 1)
+
+        # GetTimeSeriesData points: {'Timestamp': ..., 'NumericValue1': ..., 'NumericValue2': ...}
+        # A point has no NumericValue property for any series without a value at that time.
+        if any('Value' in point for point in points):
+            raise ValueError("GetTimeSeriesData points must have 'NumericValue1', 'NumericValue2', ... properties")
+
+        column_count = max((
+            int(key[12:]) for point in points for key in point if key.startswith('NumericValue') and key[12:].isdigit()),
+            default=0)
+
+        columns = [
+            np.fromiter((point.get(f'NumericValue{i}', np.nan) for point in points), dtype=np.float64, count=count)
+            for i in range(1, column_count + 1)]
+
+        return np.column_stack(columns) if columns else np.empty((count, 0))
+
+    @classmethod
+    def _resolve_codes(cls, timestamps, periods, code_name):
+        indexes = _resolve_period_indexes(timestamps, periods)
+
+        # Index -1 selects the trailing MISSING_CODE entry
+        codes = np.array([period[code_name] for period in periods] + [cls.MISSING_CODE], dtype=np.int32)
+
+        return codes[indexes]
+
+    def to_pandas(self):
+        """
+        Converts the points to a pandas DataFrame, indexed by the point times in the series' UTC offset.
+
+        The DataFrame columns share memory with the NumPy arrays wherever pandas allows.
+        """
+        # pandas is slow to import, and is only needed here
+        import pandas as pd
+
+        index = pd.DatetimeIndex(self.timestamps, name='Timestamp').tz_localize('UTC')
+
+        if self.utc_offset is not None:
+            index = index.tz_convert(timezone(self.utc_offset))
+
+        if self.values.ndim == 1:
+            columns = {'Value': self.values, 'GradeCode': self.grade_codes, 'ApprovalLevel': self.approval_levels}
+        else:
+            columns = {}
+            for i, series in enumerate(self.metadata.get('TimeSeries', [])):
+                identifier = series.get('Identifier', str(i + 1))
+                columns[identifier] = self.values[:, i]
+                columns[f'{identifier} GradeCode'] = self.grade_codes[:, i]
+                columns[f'{identifier} ApprovalLevel'] = self.approval_levels[:, i]
+
+        return pd.DataFrame(columns, index=index, copy=False)
+
+
+class timeseries_client:
+    """
+    A client wrapper for AQUARIUS Time-Series REST API consumption.
+
+    Each of the public REST APIs is exposed as a timeseries_session object:
+
+    publish      => An authenticated session to the /AQUARIUS/Publish/v2 endpoint
+    acquisition  => An authenticated session to the /AQUARIUS/Acquisition/v2 endpoint
+    provisioning => An authenticated session to the /AQUARIUS/Provisioning/v1 endpoint
+
+    >>> timeseries = timeseries_client('localhost', 'admin', 'admin')
+    >>> timeseries.publish.get('/session')
+    {'Username': 'admin', 'Locale': 'en', 'Token': 'GWVheAEXYDkJrqKWxFA1vQ2', 'CanConfigureSystem': True, 'IpAddress': '172.16.1.90'}
+
+    Session resources will be automatically cleaned up if used in WITH statement.
+
+    >>> with timeseries_client('localhost', 'admin', 'admin') as timeseries:
+    ...   parameters = timeseries.publish.get('/GetParameterList')["Parameters"]
+    ...   print (f"There are {len(parameters)} parameters")
+    ...
+    >>> # The session will be disconnected now, even if an exception was thrown in the body of the WITH statement.
+
+    Set metadata_cache_dir to keep the ServiceStack operation metadata used by send_batch_requests() in an on-disk cache,
+    shared by every process on the host, instead of downloading it once per session.
+
+    Set token_cache to a file path (or a SessionTokenCache object) to let every process on the host share one authenticated
+    session, instead of each process creating its own. A shared session is not destroyed when the client disconnects,
+    since other processes may still be using it. The server expires it once it is no longer used.
+
+    All the sessions to the server share one pool of keep-alive connections. Use pool_size to allow more concurrent requests,
+    pool_block to make requests wait for a pooled connection rather than open a throw-away connection when the pool is busy,
+    and keep_alive=False to close each connection after every request. Or supply your own transport, from create_transport().
+
+    Idempotent requests to any endpoint are retried after transient failures, as configured by the shared retry_policy.
+    Its counters show how often requests were retried. Use RetryPolicy(max_retries=0) to disable retries.
+
+    Set response_cache to a directory path (or a ResponseCache object) to cache the responses of slowly changing
+    Publish GET requests, like GetParameterList, on disk across runs. The cache revalidates responses with
+    conditional requests when the server supports them, and otherwise refreshes each route after its TTL expires.
+
+    Identifier to UniqueId lookups are kept in the identifier_cache, an IdentifierCache by default.
+    Use IdentifierCache(max_size=0) to disable the cache.
+
+    The client can be shared by many threads. When the session expires, exactly one thread reauthenticates
+    and every rejected request is replayed with the new token. Set token_refresh_interval to a timedelta, shorter than
+    the server's session timeout, to replace the token in the background before it ever expires.
+    """
+
+    def __init__(self, hostname, username="admin", password="admin", verify=True, metadata_cache_dir=None, token_cache=None,
+                 pool_size=10, pool_block=False, keep_alive=True, transport=None, retry_policy=None, token_refresh_interval=None,
+                 identifier_cache=None, response_cache=None):
+        if transport is None:
+            transport = create_transport(pool_size=pool_size, pool_block=pool_block)
+
+        self.transport = transport
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._keep_alive = keep_alive
+        self.identifier_cache = identifier_cache if identifier_cache is not None else IdentifierCache()
+
+        # Create the three endpoint sessions
+        self.publish = self._create_session(hostname, "/AQUARIUS/Publish/v2", verify=verify)
+        self.acquisition = self._create_session(hostname, "/AQUARIUS/Acquisition/v2", verify=verify)
+        self.provisioning = self._create_session(hostname, "/AQUARIUS/Provisioning/v1", verify=verify)
+
+        if isinstance(token_cache, str):
+            token_cache = SessionTokenCache(token_cache)
+
+        self._token_cache = token_cache
+
+        if isinstance(response_cache, str):
+            response_cache = ResponseCache(directory=response_cache)
+
+        if response_cache is not None:
+            self.publish.response_cache = response_cache
+            self.publish.cache_partition = username
+
+        self._configure_reauthentication(username, password)
+
+        # Authenticate once
+        self.connect(username, password)
+
+        if token_refresh_interval is not None:
+            self._start_token_refresh(token_refresh_interval)
+
+        # The server version is only fetched when it is first needed
+        self._version_session = self._create_session(hostname, "/AQUARIUS/apps/v1", verify=verify)
+        self._server_version = None
+
+        if metadata_cache_dir is not None:
+            metadata_cache = OperationMetadataCache(metadata_cache_dir)
+
+            for session in [self.publish, self.acquisition, self.provisioning]:
+                session.metadata_cache = metadata_cache
+                session.server_version = lambda: self.server_version
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.disconnect()
+
+    def _create_session(self, hostname, root_path, verify=True):
+        session = TimeSeriesSession(hostname, root_path, verify=verify, transport=self.transport, retry_policy=self.retry_policy)
+
+        if not self._keep_alive:
+            session.headers.update({'Connection': 'close'})
+
+        return session
+
+    @property
+    def server_version(self):
+        """The version of the connected AQTS app server"""
+        if self._server_version is None:
+            self._server_version = ServerVersion(self._version_session.get('/version')["ApiVersion"])
+
+        return self._server_version
+
+    def connect(self, username, password, stale_token=None):
+        """
+        Authenticates the session with AQUARIUS.
+
+        All subsequent requests to any public endpoint will be authenticated using the stored session token.
+
+        When a token cache is configured, a token cached by any process is reused instead of creating a new session.
+        :param username: The AQTS username
+        :param password: The AQTS password
+        :param stale_token: Optional token which is known to have expired, and must not be reused
+        """
+        if self._token_cache is None:
+            token = self._create_session_token(username, password)
+        else:
+            key = self._token_cache.create_key(self.publish.base_url, username, password)
+
+            with self._token_cache.locked():
+                token = self._token_cache.get(key)
+
+                if token is None or token == stale_token:
+                    token = self._create_session_token(username, password)
+                    self._token_cache.set(key, token)
+
+        self.publish.set_session_token(token)
+        self.acquisition.set_session_token(token)
+        self.provisioning.set_session_token(token)
+        self._session_token = token
+
+        return token
+
+    def _create_session_token(self, username, password):
+        return self.publish._post_raw('/session', json={'Username': username, 'EncryptedPassword': password}).text
+
+    def disconnect(self):
+        """Destroys the authenticated session, unless it is shared with other processes via the token cache"""
+        if self._token_refresh_stopped is not None:
+            self._token_refresh_stopped.set()
+
+        if self._token_cache is None:
+            self.publish.delete('/session')
+
+    def _configure_reauthentication(self, username, password):
+        self._username = username
+        self._password = password
+        self._session_token = None
+        self._reauthentication_lock = threading.Lock()
+        self._reauthenticating = threading.local()
+        self._token_refresh_stopped = None
+        self._reauthenticate_session = requests.Session()
+        self._reauthenticate_session.mount('http://', self.transport)
+        self._reauthenticate_session.mount('https://', self.transport)
+
+        self.publish.hooks['response'].append(self._reauthenticate)
+        self.acquisition.hooks['response'].append(self._reauthenticate)
+        self.provisioning.hooks['response'].append(self._reauthenticate)
+
+    def _reauthenticate(self, response, *args, **kwargs):
+        if response.status_code != 401 or getattr(self._reauthenticating, 'active', False):
+            # Never reauthenticate the authentication request itself, or a replayed request
+            return None
+
+        token = self._refresh_session_token(stale_token=response.request.headers.get('X-Authentication-Token'))
+
+        # Replay the rejected request with the fresh token, just once
+        response.request.headers.update({"X-Authentication-Token": token})
+        self._reauthenticating.active = True
+
+        try:
+            return self._reauthenticate_session.send(response.request, **kwargs)
+        finally:
+            self._reauthenticating.active = False
+
+    def _refresh_session_token(self, stale_token):
+        """
+        Replaces the stale session token, exactly once.
+
+        Any number of threads can see their requests rejected by an expired token at the same time.
+        The first thread through the lock creates a new session, and every other thread just picks up the new token.
+        """
+        with self._reauthentication_lock:
+            if self._session_token != stale_token:
+                # Another thread has already replaced the stale token
+                return self._session_token
+
+            self._reauthenticating.active = True
+
+            try:
+                return self.connect(self._username, self._password, stale_token=stale_token)
+            finally:
+                self._reauthenticating.active = False
+
+    def _start_token_refresh(self, interval):
+        """Proactively replaces the session token in the background, so that requests never see an expired token"""
+        self._token_refresh_stopped = threading.Event()
+
+        def refresh_periodically():
+            while not self._token_refresh_stopped.wait(interval.total_seconds()):
+                replaced_token = self._session_token
+
+                try:
+                    token = self._refresh_session_token(stale_token=replaced_token)
+                except requests_exceptions.RequestException:
+                    # Requests will still reauthenticate on demand if the refresh fails
+                    continue
+
+                if token != replaced_token and self._token_cache is None:
+                    # The replaced session is still alive on the server, so end it instead of leaking one per interval.
+                    # Tokens from a token cache can still be in use by other processes, and are left to expire.
+                    self._delete_session_token(replaced_token)
+
+        threading.Thread(target=refresh_periodically, name='timeseries_client token refresh', daemon=True).start()
+
+    def _delete_session_token(self, token):
+        """Ends the session of a token which is no longer used, ignoring any failure"""
+        # Never let a rejected delete reauthenticate, since the replay would delete the current session instead
+        self._reauthenticating.active = True
+
+        try:
+            self.publish._delete_raw('/session', headers={'X-Authentication-Token': token})
+        except requests_exceptions.RequestException:
+            # The session will expire on its own
+            pass
+        finally:
+            self._reauthenticating.active = False
+
+    def _create_authenticated_endpoint(self, root_path: str, verify=True) -> TimeSeriesSession:
+        """
+        Creates an authenticated endpoint to something other than the public API surface.
+
+        :param root_path: The path to the endpoint on the AQTS app server
+        :param verify: The standard requests library certificate check
+        :return: An authenticated session for making requests to the end point
+        """
+        url = urlparse(self.publish.base_url)
+        session = self._create_session(f'{url.scheme}://{url.netloc}', root_path, verify=verify)
+        session.set_session_token(self.publish.headers['X-Authentication-Token'])
+        return session
+
+    def isVersionLessThan(self, source_version, target_version=None):
+        """
+        Is the source version strictly less than the target version.
+
+        :param source_version: The source version, in dotted.string notation
+        :param target_version: If None, the connected server version is used
+        :return: True if the source version is strictly less than the target version
+        """
+        if target_version is None:
+            target_version = self.server_version
+
+        if not isinstance(source_version, ServerVersion):
+            source_version = ServerVersion(source_version)
+
+        return source_version < target_version
+
+    def isServerVersionLessThan(self, target_version):
+        return self.isVersionLessThan(self.server_version, target_version)
+
+    @staticmethod
+    def iso8601(datetime):
+        """Formats the datetime object as an ISO8601 timestamp"""
+        return pyrfc3339.generate(datetime, microseconds=True)
+
+    @staticmethod
+    def datetime(text):
+        """
+        Parses the ISO8601 timestamp to a standard python datetime object
+
+        Use parse_timestamps() to parse many timestamps at once.
+        """
+        return _parse_timestamp(text)
+
+    def coerceQueryTime(self, querytime):
+        """
+        Coerces the timevalue into a best possible query time format.
+
+        Naive datetimes are treated as client-local times.
+        Unambiguous datetimes are formated as ISO8601.
+        Non datetime objects are left as-is.
+
+        :param querytime: a datetime to
+        :return: The coerced text value
+        """
+        if isinstance(querytime, datetime):
+            if querytime.tzinfo is None:
+                # Format naive date times as a local time
+                return querytime.strftime('%Y-%m-%d %H:%M:%S.%f')
+            else:
+                # Format unambiguous times as ISO8061
+                return self.iso8601(querytime)
+
+        # Otherwise return the value as-is and hope for the best
+        return querytime
+
+    def getTimeSeriesUniqueId(self, timeSeriesIdentifier):
+        """
+        Gets the unique ID of a time-series.
+
+        If the input is not a 'Parameter.Label@Location' identifier, then
+        the input is assumed to already be a unique ID and is not modified.
+
+        :param timeSeriesIdentifier: The identifier to lookup
+        :return: The unique ID of the series
+        """
+        return self.getTimeSeriesUniqueIds([timeSeriesIdentifier])[0]
+
+    def getTimeSeriesUniqueIds(self, timeSeriesIdentifiers, maxConcurrency=4):
+        """
+        Gets the unique IDs of many time-series.
+
+        Identifiers which are not in the identifier_cache are grouped by location, and each distinct location's
+        time-series descriptions are fetched just once, with up to maxConcurrency requests in flight.
+        Inputs which are not 'Parameter.Label@Location' identifiers are assumed to already be unique IDs.
+
+        >>> client.getTimeSeriesUniqueIds(['Stage.Working@Loc1', 'Discharge.Working@Loc1', 'Stage.Working@Loc2'])
+
+        :param timeSeriesIdentifiers: The identifiers to lookup
+        :param maxConcurrency: The maximum number of locations being fetched at once
+        :return: A list of the unique IDs of the series, in the same order
+        """
+        unique_ids = {}
+        locations = {}
+
+        for identifier in timeSeriesIdentifiers:
+            match = re.search('[^\\\\]@(?P<location>.+)$', identifier)
+            if not match:
+                unique_ids[identifier] = identifier
+                continue
+
+            unique_id = self.identifier_cache.get(IdentifierCache.time_series_key(identifier))
+            if unique_id is not None:
+                unique_ids[identifier] = unique_id
+            else:
+                locations.setdefault(match.group('location'), []).append(identifier)
+
+        for location_unique_ids in ordered_concurrent_map(
+                self._getTimeSeriesUniqueIdsAtLocation, locations, min(maxConcurrency, len(locations))):
+            unique_ids.update(location_unique_ids)
+
+        for identifiers in locations.values():
+            for identifier in identifiers:
+                if identifier not in unique_ids:
+                    raise TimeSeriesNotFoundException(identifier)
+
+        return [unique_ids[identifier] for identifier in timeSeriesIdentifiers]
+
+    def _getTimeSeriesUniqueIdsAtLocation(self, location):
+        # Get the descriptions from the location
+        try:
+            descriptions = self.publish.get(
+                '/GetTimeSeriesDescriptionList', params={'LocationIdentifier': location})[
+                "TimeSeriesDescriptions"]
+        except requests.exceptions.HTTPError as e:
+            raise LocationNotFoundException(location)
+
+        unique_ids = {d['Identifier']: d['UniqueId'] for d in descriptions}
+
+        # Remember every series at the location, since scripts usually resolve more than one
+        self.identifier_cache.put_many({IdentifierCache.time_series_key(identifier): unique_id
+                                        for identifier, unique_id in unique_ids.items()})
+
+        return unique_ids
+
+    def getLocationIdentifier(self, timeSeriesOrRatingModelIdentifier):
+        """Extracts the location identifier from a 'Parameter.Label@Location' time-series or rating model identifier"""
+        match = re.search('[^\\\\]@(?P<location>.+)$', timeSeriesOrRatingModelIdentifier)
+        if not match:
+            raise LocationNotFoundException(timeSeriesOrRatingModelIdentifier)
+
+        return match.group('location')
+
+    def getLocationData(self, identifier):
+        """Gets the location data"""
+        return self.publish.get(
+            "/GetLocationData", params={'LocationIdentifier': identifier})
+
+    def getLocationUniqueId(self, locationIdentifier):
+        """
+        Looks up the location unique ID from an identifier.
+
+        If the the input is already a unique ID, no lookup/transformation is performed.
+
+        :param locationIdentifier: The location indentifier to lookup
+        :return: The unique ID of the location
+        """
+        if re.match('^[0-9a-f]{32}$', locationIdentifier):
+            # Return existing GUIDs as-is
+            return locationIdentifier
+
+        key = IdentifierCache.location_key(locationIdentifier)
+        unique_id = self.identifier_cache.get(key)
+        if unique_id is not None:
+            return unique_id
+
+        locationData = self.getLocationData(locationIdentifier)
+        self.identifier_cache.put(key, locationData['UniqueId'])
+
+        return locationData['UniqueId']
+
+    def getRatings(self, locationIdentifier, queryFrom=None, queryTo=None, inputParameter=None, outputParameter=None):
+        ratingModelDescriptions = self.publish.get(
+            "/GetRatingModelDescriptionList",
+            params={
+                'LocationIdentifier': locationIdentifier,
+                'QueryFrom': self.coerceQueryTime(queryFrom),
+                'QueryTo': self.coerceQueryTime(queryTo),
+                'InputParameter': inputParameter,
+                'OutputParameter': outputParameter
+            })['RatingModelDescriptions']
+
+        # TODO: Get the rating curves in effect during those times
+        return ratingModelDescriptions
+
+    def getRatingModelOutputValues(self, ratingModelIdentifier, inputValues, effectiveTime=None, applyShifts=None):
+        return self.publish.get(
+            "/GetRatingModelOutputValues",
+            params={
+                'RatingModelIdentifier': ratingModelIdentifier,
+                'InputValues': inputValues,
+                'EffectiveTime': self.coerceQueryTime(effectiveTime),
+                'ApplyShifts': applyShifts
+            })['OutputValues']
+
+    def getFieldVisits(self, locationIdentifier, queryFrom=None, queryTo=None, activityType=None):
+        fieldVisitDescriptions = self.publish.get(
+            "/GetFieldVisitDescriptionList",
+            params={
+                'LocationIdentifier': locationIdentifier,
+                'QueryFrom': self.coerceQueryTime(queryFrom),
+                'QueryTo': self.coerceQueryTime(queryTo),
+                'ActivityType': activityType
+            })['FieldVisitDescriptions']
+
+        # TODO: Fetch details for each visit
+        return fieldVisitDescriptions
+
+    def getTimeSeriesDescriptions(self, locationIdentifier=None, parameter=None, publish=None, computationIdentifier=None, computationPeriodIdentifier=None, extendedFilters=None):
+        return self.publish.get(
+            "/GetTimeSeriesDescriptionList",
+            params={
+                'LocationIdentifier': locationIdentifier,
+                'Parameter': parameter,
+                'Publish': publish,
+                'ComputationIdentifier': computationIdentifier,
+                'ComputationPeriodIdentifier': computationPeriodIdentifier,
+                'ExtendedFilters': self.publish.toJSV(extendedFilters)
+            })['TimeSeriesDescriptions']
+
+    def getTimeSeriesData(self, timeSeriesIds, queryFrom=None, queryTo=None, outputUnitIds=None, includeGapMarkers=None):
+        return self.publish.get(
+            "/GetTimeSeriesData",
+            params=self._getTimeSeriesDataParams(timeSeriesIds, queryFrom, queryTo, outputUnitIds, includeGapMarkers))
+
+    def streamTimeSeriesData(self, timeSeriesIds, queryFrom=None, queryTo=None, outputUnitIds=None, includeGapMarkers=None, chunkSize=10000):
+        """
+        Streams the points of getTimeSeriesData(), parsing them as the response arrives.
+
+        >>> with client.streamTimeSeriesData(['Stage.Working@Loc1', 'Discharge.Working@Loc1']) as data:
+        ...   for points in data:
+        ...     process(points)
+        ...   series = data.properties['TimeSeries']
+
+        :return: A StreamedJsonResponse yielding lists of at most chunkSize points. All the other response properties are in its properties dictionary.
+        """
+        return self.publish.get_streamed(
+            "/GetTimeSeriesData", 'Points', chunk_size=chunkSize,
+            params=self._getTimeSeriesDataParams(timeSeriesIds, queryFrom, queryTo, outputUnitIds, includeGapMarkers))
+
+    def _getTimeSeriesDataParams(self, timeSeriesIds, queryFrom, queryTo, outputUnitIds, includeGapMarkers):
+        if isinstance(timeSeriesIds, list):
+            timeSeriesIds = self.getTimeSeriesUniqueIds(timeSeriesIds)
+        else:
+            timeSeriesIds = self.getTimeSeriesUniqueId(timeSeriesIds)
+
+        return {
+            'TimeSeriesUniqueIds': self.publish.toJSV(timeSeriesIds),
+            'TimeSeriesOutputUnitIds': self.publish.toJSV(outputUnitIds),
+            'QueryFrom': self.coerceQueryTime(queryFrom),
+            'QueryTo': self.coerceQueryTime(queryTo),
+            'IncludeGapMarkers': includeGapMarkers
+        }
+
+    def getTimeSeriesCorrectedData(self, timeSeriesIdentifier, queryFrom=None, queryTo=None, getParts=None, includeGapMarkers=None, windowCount=None, maxConcurrency=4):
+        """
+        Gets the corrected data of a time-series.
+
+        Long time ranges can be split into windowCount windows, fetched with up to maxConcurrency requests in flight,
+        and stitched back together into one response. Each request is smaller, so it is much less likely to time out.
+
+        >>> response = client.getTimeSeriesCorrectedData('Stage.Working@Loc1', queryFrom=datetime(1990, 1, 1, tzinfo=timezone.utc),
+        ...   queryTo=datetime(2020, 1, 1, tzinfo=timezone.utc), windowCount=30)
+
+        :param windowCount: When set, queryFrom and queryTo must both be set, as datetimes or ISO 8601 text
+        :param maxConcurrency: The maximum number of windows being fetched at once
+        """
+        params = self._getTimeSeriesCorrectedDataParams(timeSeriesIdentifier, queryFrom, queryTo, getParts, includeGapMarkers)
+
+        if not windowCount or windowCount <= 1:
+            return self.publish.get("/GetTimeSeriesCorrectedData", params=params)
+
+        if queryFrom is None or queryTo is None:
+            raise ValueError('Both queryFrom and queryTo are required to fetch the corrected data in windows')
+
+        def fetch(window):
+            return self.publish.get("/GetTimeSeriesCorrectedData", params={
+                **params,
+                'QueryFrom': self.coerceQueryTime(window[0]),
+                'QueryTo': self.coerceQueryTime(window[1])})
+
+        windows = time_windows(queryFrom, queryTo, windowCount)
+
+        return merge_time_series_windows(list(ordered_concurrent_map(fetch, windows, maxConcurrency)))
+
+    def streamTimeSeriesCorrectedData(self, timeSeriesIdentifier, queryFrom=None, queryTo=None, getParts=None, includeGapMarkers=None, chunkSize=10000):
+        """
+        Streams the points of getTimeSeriesCorrectedData(), parsing them as the response arrives.
+
+        The Approvals, Grades, Qualifiers, Methods, Notes and other metadata are collected in the properties dictionary.
+        AQTS sends the metadata ahead of the points, so it is usually available as soon as the first chunk is yielded.
+
+        >>> with client.streamTimeSeriesCorrectedData('Stage.Working@Loc1', queryFrom=..., queryTo=...) as data:
+        ...   for points in data:
+        ...     process(points, data.properties['Grades'])
+
+        :return: A StreamedJsonResponse yielding lists of at most chunkSize points. All the other response properties are in its properties dictionary.
+        """
+        return self.publish.get_streamed(
+            "/GetTimeSeriesCorrectedData", 'Points', chunk_size=chunkSize,
+            params=self._getTimeSeriesCorrectedDataParams(timeSeriesIdentifier, queryFrom, queryTo, getParts, includeGapMarkers))
+
+    def getTimeSeriesDataColumns(self, timeSeriesIds, queryFrom=None, queryTo=None, outputUnitIds=None, includeGapMarkers=None):
+        """
+        Gets the points of getTimeSeriesData() as NumPy arrays, without ever holding more than one chunk of point dictionaries.
+
+        :return: A TimeSeriesPoints object, with one column of values for each requested series
+        """
+        return TimeSeriesPoints.from_stream(
+            self.streamTimeSeriesData(timeSeriesIds, queryFrom, queryTo, outputUnitIds, includeGapMarkers), is_multi_series=True)
+
+    def getTimeSeriesCorrectedDataColumns(self, timeSeriesIdentifier, queryFrom=None, queryTo=None, getParts=None, includeGapMarkers=None):
+        """
+        Gets the points of getTimeSeriesCorrectedData() as NumPy arrays, without ever holding more than one chunk of point dictionaries.
+
+        >>> points = client.getTimeSeriesCorrectedDataColumns('Stage.Working@Loc1')
+        >>> print(points.values.mean(), points.timestamps[-1], points.approval_levels[-1])
+
+        :return: A TimeSeriesPoints object
+        """
+        return TimeSeriesPoints.from_stream(
+            self.streamTimeSeriesCorrectedData(timeSeriesIdentifier, queryFrom, queryTo, getParts, includeGapMarkers))
+
+    def _getTimeSeriesCorrectedDataParams(self, timeSeriesIdentifier, queryFrom, queryTo, getParts, includeGapMarkers):
+        return {
+            'TimeSeriesUniqueId': self.getTimeSeriesUniqueId(timeSeriesIdentifier),
+            'QueryFrom': self.coerceQueryTime(queryFrom),
+            'QueryTo': self.coerceQueryTime(queryTo),
+            'GetParts': getParts,
+            'IncludeGapMarkers': includeGapMarkers
+        }
+
+    def flattenResponse(self, response):
+        """Flattens the metadata in the response, adding point-wise metadata to the 'Points' list"""
+        grades = SingleMetadataResolver(response['Grades'])
+        approvals = SingleMetadataResolver(response['Approvals'])
+        methods = SingleMetadataResolver(response['Methods'])
+        gapTolerances = SingleMetadataResolver(response['GapTolerances'])
+        qualifiers = OverlappingMetadataResolver(response['Qualifiers'])
+        notes = OverlappingMetadataResolver(response['Notes'])
+
+        for point in response['Points']:
+            timestamp = point['Timestamp']
+            point['GradeCode'] = grades.resolve(timestamp)
+            point['Approval'] = approvals.resolve(timestamp)
+            point['Method'] = methods.resolve(timestamp)
+            point['GapTolerance'] = gapTolerances.resolve(timestamp)
+            point['Qualifiers'] = qualifiers.resolve(timestamp)
+            point['Notes'] = notes.resolve(timestamp)
+
+    def flattenResponseIndexes(self, response, timestamps=None):
+        """
+        Resolves the point-wise metadata of a getTimeSeriesCorrectedData() response, without touching the 'Points' list.
+
+        Unlike flattenResponse(), every point is resolved at once, by a binary search of the sorted metadata boundaries.
+        This needs the numpy package.
+
+        >>> response = client.getTimeSeriesCorrectedData('Stage.Working@Loc1')
+        >>> indexes = client.flattenResponseIndexes(response)
+        >>> i = indexes['Grades'][0]
+        >>> first_grade = response['Grades'][i] if i >= 0 else None
+        >>> first, stop = indexes['Qualifiers']
+        >>> first_qualifier_points = response['Points'][first[0]:stop[0]]
+
+        :param response: The getTimeSeriesCorrectedData() response
+        :param timestamps: An optional datetime64[us] array of the UTC point times, like TimeSeriesPoints.timestamps
+        :return: A dictionary with an array for each of the 'Grades', 'Approvals', 'Methods' and 'GapTolerances' lists,
+                 holding the index of the item applied to each point, or -1 when no item applies.
+                 The 'Qualifiers' and 'Notes' items can overlap, so they have a tuple of two arrays instead,
+                 holding the index of the first point of each item, and the index just beyond its last point.
+        """
+        if np is None:
+            raise ImportError('flattenResponseIndexes() requires the numpy package. Install it via: $ pip install numpy')
+
+        if timestamps is None:
+            timestamps, _ = _datetime64_from_timestamps([point['Timestamp'] for point in response['Points']])
+
+        indexes = {name: _resolve_period_indexes(timestamps, response.get(name, []))
+                   for name in ('Grades', 'Approvals', 'Methods', 'GapTolerances')}
+        indexes.update({name: _resolve_point_ranges(timestamps, response.get(name, []))
+                        for name in ('Qualifiers', 'Notes')})
+
+        return indexes
+
+    def getReportList(self):
+        """Gets all the generated reports on the system"""
+        return self.publish.get("/GetReportList")['Reports']
+
+    def deleteReport(self, reportUniqueId):
+        """Deletes the generated report from the system"""
+        self.acquisition.delete(f"/attachments/reports/{reportUniqueId}")
+
+    def uploadExternalReport(self, locationUniqueId, pathToFile, title, deleteDuplicateReports=False):
+        """Uploads a file as external report to the given location"""
+        if deleteDuplicateReports:
+            # Get the current reports
+            for r in [r for r in self.getReportList() if r['Title'] == title and not r['IsTransient']]:
+                self.deleteReport(r['ReportUniqueId'])
+
+        return self.acquisition.post(f"/locations/{locationUniqueId}/attachments/reports",
+                                     params={'Title': title},
+                                     files={'file': open(pathToFile, 'rb')})
+
+    def uploadFieldVisit(self, locationUniqueId, pathToFile):
+        """Uploads a file as a field visit to the given location"""
+        return self.acquisition.post(f"/locations/{locationUniqueId}/visits/upload/plugins",
+                                     files={'file': open(pathToFile, 'rb')})
+
+    def createLocation(self, location):
+        """ Creates a new location as specified by location dict.
+            See API docs for Location JSON/dict struct.
+            :param location: dict
+            :return: unique ID (str) of created location"""
+        response = self.provisioning.post('/locations', json=location)
+
+        return response['UniqueId']
+
+    def getLocationDescriptionList(self, **kwargs):
+        locations = self.publish.get('/GetLocationDescriptionList', params=kwargs)
+        return locations['LocationDescriptions']
+
+    def getAllLocations(self, **kwargs):
+        """
+        Gets all the locations in a system.
+
+        :return: A list of Provisioning location objects
+        """
+        descriptions = self.getLocationDescriptionList(**kwargs)
+
+        return self.provisioning.send_batch_requests(
+            '/locations/{Id}',
+            [{'LocationUniqueId': loc['UniqueId']} for loc in descriptions])
+
+    def deleteLocation(self, location_identifier_or_unique_id):
+        """
+        Deletes a location, by location identifier or by unique ID.
+
+        Note: The location needs to be completely empty.
+        See https://github.com/AquaticInformatics/examples/tree/master/TimeSeries/PublicApis/SdkExamples/LocationDeleter#locationdeleter for an alternative tool.
+
+        :param location_identifier_or_unique_id: A location identifier or a unique ID string
+        """
+        location_unique_id = self.getLocationUniqueId(location_identifier_or_unique_id)
+
+        response = self.provisioning.delete(f'/locations/{location_unique_id}')
+
+        self.identifier_cache.invalidate_unique_id(location_unique_id)
+        self.identifier_cache.invalidate_location(location_identifier_or_unique_id)
+
+        return response
+
+    def createReflectedTimeseries(self, location_identifier_or_unique_id, series):
+        """
+        Creates a reflected time-series at a location with the given attributes
+
+        :param location_identifier_or_unique_id: A location identifier or a unique ID string
+        :param series: dict (see API docs)
+        :return: unique ID of create time-series
+        """
+        location_unique_id = self.getLocationUniqueId(location_identifier_or_unique_id)
+
+        response = self.provisioning.post(
+            f'/locations/{location_unique_id}/timeseries/reflected', json=series)
+
+        return response['UniqueId']
+
+    def deleteReflectedTimeseries(self, series_identifier_or_unique_id):
+        """
+        Deletes a reflected time-series.
+
+        :param series_identifier_or_unique_id: A series identifier or unique ID
+        """
+        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+
+        response = self.provisioning.delete(f'/timeseries/{unique_id}')
+
+        self.identifier_cache.invalidate_unique_id(unique_id)
+
+        return response
+
+    def appendReflectedPoints(self, series_identifier_or_unique_id, points, start=None, end=None):
+        """
+        Queues an append request of points to a reflected time-series.
+
+        If the start or end parameters are omitted, the first and last timestamp of the points are assumed.
+
+        :param series_identifier_or_unique_id: A series identifier or unique ID
+        :param points: A list of points to append
+        :param start: Optional start datetime
+        :param end: Optional end datetime
+        :return: The append job identifier
+        """
+
+        if start is None:
+            start = self.datetime(points[0]["Time"])
+
+        if end is None:
+            end = self.datetime(points[-1]["Time"]) + timedelta(microseconds=1)
+
+        series_data = {
+            'Points': points,
+            'TimeRange': {
+                'Start': start.isoformat(),
+                'End': end.isoformat()
+            }}
+
+        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+
+        return self.acquisition.post(
+            f'/timeseries/{unique_id}/reflected', json=series_data)["AppendRequestIdentifier"]
+
+    def appendPoints(self, series_identifier_or_unique_id, points, start=None, end=None):
+        """
+        Queues an append request of points to a basic time-series.
+
+        If the start and end parameters are omitted, a basic append request is queued. Only new points will be appended.
+
+        When the start and end parameters are provided, an overwrite append request is queued.
+
+        :param series_identifier_or_unique_id: A series identifier or unique ID
+        :param points: A list of points to append
+        :param start: Optional start datetime
+        :param end: Optional end datetime
+        :return: The append job identifier
+        """
+
+        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+        series_data = {'Points': points}
+
+        if start is None and end is None:
+            return self.acquisition.post(
+                f'/timeseries/{unique_id}/append', json=series_data)["AppendRequestIdentifier"]
+
+        series_data['TimeRange'] = {
+            'Start': start.isoformat(),
+            'End': end.isoformat()
+        }
+
+        return self.acquisition.post(
+            f'/timeseries/{unique_id}/overwriteappend', json=series_data)["AppendRequestIdentifier"]
+
+    def appendPointsInChunks(self, series_identifier_or_unique_id, points, start=None, end=None,
+                             max_points=100000, max_bytes=None, max_concurrency=2):
+        """
+        Queues the points to a basic time-series as a sequence of smaller append requests, with a bounded number in flight.
+
+        Like appendPoints(), the points are only appended when start and end are omitted.
+        When both are provided, the start-to-end time range is overwritten, split into contiguous sub-ranges: one per chunk.
+        With no points at all, one request still overwrites the whole time range.
+
+        >>> stats = client.appendPointsInChunks('Stage.Working@Loc1', generate_points(), max_points=50000, max_concurrency=4)
+        >>> for identifier, status in client.waitForCompletedAppendRequests(stats['identifiers']): ...
+
+        :param series_identifier_or_unique_id: A series identifier or unique ID
+        :param points: A list or any iterable of points, in ascending time order. Generators are consumed lazily.
+        :param start: Optional start datetime
+        :param end: Optional end datetime
+        :param max_points: The maximum number of points in each request
+        :param max_bytes: The optional maximum size of each encoded request body
+        :param max_concurrency: The maximum number of requests being uploaded at once
+        :return: A dictionary of the 'identifiers' of the append jobs, in time order, plus the 'chunks', 'points',
+                 'bytes' and 'seconds' of the uploads, and their 'points_per_second' and 'bytes_per_second' throughput
+        """
+        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+
+        if start is None and end is None:
+            return self._appendChunks(f'/timeseries/{unique_id}/append', points, None, None, max_points, max_bytes, max_concurrency)
+
+        return self._appendChunks(f'/timeseries/{unique_id}/overwriteappend', points, start.isoformat(), end.isoformat(),
+                                  max_points, max_bytes, max_concurrency)
+
+    def appendReflectedPointsInChunks(self, series_identifier_or_unique_id, points, start=None, end=None,
+                                      max_points=100000, max_bytes=None, max_concurrency=2):
+        """
+        Queues the points to a reflected time-series as a sequence of smaller append requests, with a bounded number in flight.
+
+        Like appendReflectedPoints(), the first and last timestamp of the points are assumed if start or end are omitted.
+        The time range is split into contiguous sub-ranges: one per chunk.
+
+        See appendPointsInChunks() for the other parameters and the returned statistics.
+        """
+        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+
+        return self._appendChunks(f'/timeseries/{unique_id}/reflected', points,
+                                  start.isoformat() if start is not None else None,
+                                  end.isoformat() if end is not None else None,
+                                  max_points, max_bytes, max_concurrency, is_reflected=True)
+
+    def _encodePointChunks(self, points, max_points, max_bytes):
+        """
+        Yields (first point time, last point time, point count, encoded points) chunks, encoding every point exactly once.
+
+        The encoded points of each chunk are one comma-separated buffer, ready to become the body of a request.
+        """
+        codec = self.acquisition.json_codec
+        # Leave room for the request envelope and its TimeRange
+        body_limit = max_bytes - 256 if max_bytes is not None else None
+
+        chunk = bytearray()
+        count = 0
+        first_time = last_time = None
+
+        for point in points:
+            encoded = codec.dumps(point)
+
+            if count and (count >= max_points or (body_limit is not None and len(chunk) + len(encoded) + 1 > body_limit)):
+                yield first_time, last_time, count, chunk
+                chunk = bytearray()
+                count = 0
+
+            if count:
+                chunk += b','
+            else:
+                first_time = point['Time']
+
+            chunk += encoded
+            count += 1
+            last_time = point['Time']
+
+        if count:
+            yield first_time, last_time, count, chunk
+
+    def _appendChunks(self, route, points, start, end, max_points, max_bytes, max_concurrency, is_reflected=False):
+        codec = self.acquisition.json_codec
+        is_overwrite = start is not None or is_reflected
+
+        def ranged_chunks():
+            # Look one chunk ahead, since each chunk's time range ends where the next chunk starts
+            chunks = self._encodePointChunks(points, max_points, max_bytes)
+            previous = next(chunks, None)
+            range_start = start
+
+            if previous is None and is_overwrite and start is not None and end is not None:
+                # No points at all still overwrites the whole time range, like appendPoints() with an empty list
+                yield 0, b'', {'Start': start, 'End': end}
+
+            while previous is not None:
+                following = next(chunks, None)
+                first_time, last_time, count, encoded = previous
+
+                if range_start is None:
+                    range_start = first_time
+
+                if following is not None:
+                    range_end = following[0]
+                elif end is not None:
+                    range_end = end
+                else:
+                    range_end = (self.datetime(last_time) + timedelta(microseconds=1)).isoformat()
+
+                yield count, encoded, {'Start': range_start, 'End': range_end} if is_overwrite else None
+
+                range_start = range_end
+                previous = following
+
+        def upload(chunk):
+            count, encoded, time_range = chunk
+            envelope_end = b']' + (b',"TimeRange":' + codec.dumps(time_range) if time_range is not None else b'') + b'}'
+            body = b''.join((b'{"Points":[', encoded, envelope_end))
+
+            identifier = self.acquisition.post(
+                route, data=body, headers={'Content-Type': 'application/json'})["AppendRequestIdentifier"]
+
+            return identifier, count, len(body)
 
-    def __init__(self, items):
-        self.items = items
-        self.index = 0
-        self.actives = []
+        started = perf_counter()
+        stats = {'identifiers': [], 'chunks': 0, 'points': 0, 'bytes': 0}
 
-    def resolve(self, timestamp):
-        # Remove all items from the active list which are now stale
-        self.actives = [item for item in self.actives if item['EndTime'] > timestamp]
+        for identifier, point_count, byte_count in ordered_concurrent_map(upload, ranged_chunks(), max_concurrency):
+            stats['identifiers'].append(identifier)
+            stats['chunks'] += 1
+            stats['points'] += point_count
+            stats['bytes'] += byte_count
 
-        # Add any new items that have just started
-        while self.index < len(self.items) and self.items[self.index]['StartTime'] <= timestamp:
-            self.actives.append(self.items[self.index])
-            self.index += 1
+        seconds = perf_counter() - started
+        stats['seconds'] = seconds
+        stats['points_per_second'] = stats['points'] / seconds if seconds else 0
+        stats['bytes_per_second'] = stats['bytes'] / seconds if seconds else 0
 
-        return [item for item in self.actives if item['StartTime'] <= timestamp < item['EndTime']]
+        return stats
 
+    def getAppendStatus(self, append_request_identifier):
+        """
+        Gets the status of a queue append request.
 
-class timeseries_client:
-    """
-    A client wrapper for AQUARIUS Time-Series REST API consumption.
+        :param append_request_identifier: The request identifier
+        :return: The status of the append request
+        """
+        return self.acquisition.get(f'/timeseries/appendstatus/{append_request_identifier}')
 
-    Each of the public REST APIs is exposed as a timeseries_session object:
+    def waitForCompletedAppendRequest(self, append_request_identifier, timeout=timedelta(minutes=5)):
+        """
+        Waits for a queued append request to complete.
 
-    publish      => An authenticated session to the /AQUARIUS/Publish/v2 endpoint
-    acquisition  => An authenticated session to the /AQUARIUS/Acquisition/v2 endpoint
-    provisioning => An authenticated session to the /AQUARIUS/Provisioning/v1 endpoint
+        :param append_request_identifier: The request identifier
+        :param timeout: Optional timeout parameter. Can be set to None to wait forever
+        :return: The completed or failed append request status
+        """
+        for _, status in self.waitForCompletedAppendRequests([append_request_identifier], timeout, max_concurrency=1):
+            return status
 
-    >>> timeseries = timeseries_client('localhost', 'admin', 'admin')
-    >>> timeseries.publish.get('/session')
-    {'Username': 'admin', 'Locale': 'en', 'Token': 'GWVheAEXYDkJrqKWxFA1vQ2', 'CanConfigureSystem': True, 'IpAddress': '172.16.1.90'}
+    def waitForCompletedAppendRequests(self, append_request_identifiers, timeout=timedelta(minutes=5), max_concurrency=8):
+        """
+        Waits for many queued append requests to complete, yielding each status as soon as its request completes.
 
-    Session resources will be automatically cleaned up if used in WITH statement.
+        All the pending requests are polled concurrently in rounds, sharing one polling delay.
+        The delay starts at 50 milliseconds and doubles (up to 20 seconds) after every round where nothing completed.
+        Once the overall timeout expires, the last (still pending) status of each unfinished request is yielded.
 
-    >>> with timeseries_client('localhost', 'admin', 'admin') as timeseries:
-    ...   parameters = timeseries.publish.get('/GetParameterList')["Parameters"]
-    ...   print (f"There are {len(parameters)} parameters")
-    ...
-    >>> # The session will be disconnected now, even if an exception was thrown in the body of the WITH statement.
+        >>> stats = client.appendPointsInChunks('Stage.Working@Location', points)
+        >>> for identifier, status in client.waitForCompletedAppendRequests(stats['identifiers']):
+        ...     print(f"{identifier}: {status['AppendStatus']}")
+
+        :param append_request_identifiers: An iterable of append request identifiers
+        :param timeout: Optional timeout for all the requests. Can be set to None to wait forever
+        :param max_concurrency: The maximum number of status requests in flight at once
+        :return: A generator of (append request identifier, completed or failed append request status) tuples
+        """
+        pending = list(OrderedDict.fromkeys(append_request_identifiers))
+        deadline = perf_counter() + timeout.total_seconds() if timeout else None
+        delay = timedelta(milliseconds=50)
+
+        def poll(append_request_identifier):
+            return append_request_identifier, self.getAppendStatus(append_request_identifier)
+
+        while pending:
+            still_pending = []
+
+            for append_request_identifier, status in ordered_concurrent_map(poll, pending, max_concurrency):
+                if status['AppendStatus'] != 'Pending':
+                    yield append_request_identifier, status
+                else:
+                    still_pending.append((append_request_identifier, status))
+
+            if not still_pending:
+                return
+
+            remaining = deadline - perf_counter() if deadline is not None else None
+
+            if remaining is not None and remaining <= 0:
+                yield from still_pending
+                return
+
+            seconds = delay.total_seconds()
+            sleep(min(seconds, remaining) if remaining is not None else seconds)
+
+            if len(still_pending) == len(pending) and delay < timedelta(seconds=20):
+                delay = delay * 2
+
+            pending = [append_request_identifier for append_request_identifier, _ in still_pending]
+
+
+@contextmanager
+def _sqlite_transaction(path):
+    """Opens a new connection to the SQLite file, as one transaction which is committed on success. Each thread gets its own connection."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    with closing(sqlite3.connect(path, timeout=30)) as db:
+        with db:
+            yield db
+
+
+class TimeSeriesCatalog:
     """
+    A local SQLite snapshot of every location and time-series description on an AQTS server.
 
-    def __init__(self, hostname, username="admin", password="admin", verify=True):
-        # Create the three endpoint sessions
-        self.publish = TimeSeriesSession(hostname, "/AQUARIUS/Publish/v2", verify=verify)
-        self.acquisition = TimeSeriesSession(hostname, "/AQUARIUS/Acquisition/v2", verify=verify)
-        self.provisioning = TimeSeriesSession(hostname, "/AQUARIUS/Provisioning/v1", verify=verify)
+    The first refresh() downloads all the descriptions. Later refreshes use the GetTimeSeriesUniqueIdList change token
+    to fetch only the descriptions of the time-series which changed since the previous refresh.
+    Filtered queries are then answered from the indexed local file, without any server requests.
 
-        self._configure_reauthentication(username, password)
+    >>> catalog = TimeSeriesCatalog(client, '/var/cache/aqts/catalog.sqlite')
+    >>> catalog.refresh()
+    >>> descriptions = catalog.getTimeSeriesDescriptions(locationIdentifier='Loc1', parameter='Stage')
+    >>> locations = catalog.getLocationDescriptionList(LocationFolder='North')
 
-        # Authenticate once
-        self.connect(username, password)
+    New locations are fetched as soon as a time-series refers to them. Location renames are only picked up by a full refresh.
+    Use refresh(prune=True) to also drop the time-series deleted since the previous refresh.
+    """
 
-        # Cache the server version
-        version_session = TimeSeriesSession(hostname, "/AQUARIUS/apps/v1", verify=verify)
-        self.server_version = ServerVersion(version_session.get('/version')["ApiVersion"])
+    _schema = [
+        "CREATE TABLE IF NOT EXISTS catalog_state (Name TEXT PRIMARY KEY, Value TEXT)",
+        "CREATE TABLE IF NOT EXISTS locations ("
+        " UniqueId TEXT PRIMARY KEY, Identifier TEXT COLLATE NOCASE, Name TEXT COLLATE NOCASE,"
+        " PrimaryFolder TEXT COLLATE NOCASE, Description TEXT)",
+        "CREATE INDEX IF NOT EXISTS locations_identifier ON locations (Identifier)",
+        "CREATE TABLE IF NOT EXISTS time_series ("
+        " UniqueId TEXT PRIMARY KEY, Identifier TEXT COLLATE NOCASE, LocationIdentifier TEXT COLLATE NOCASE,"
+        " Parameter TEXT COLLATE NOCASE, Label TEXT COLLATE NOCASE, Publish INTEGER,"
+        " ComputationIdentifier TEXT COLLATE NOCASE, ComputationPeriodIdentifier TEXT COLLATE NOCASE, Description TEXT)",
+        "CREATE INDEX IF NOT EXISTS time_series_location ON time_series (LocationIdentifier)",
+        "CREATE INDEX IF NOT EXISTS time_series_parameter ON time_series (Parameter)",
+        "CREATE INDEX IF NOT EXISTS time_series_identifier ON time_series (Identifier)",
+    ]
+
+    def __init__(self, client, path, batch_size=100, max_concurrency=4):
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+        with self._connect() as db:
+            for statement in self._schema:
+                db.execute(statement)
 
-    def __enter__(self):
-        return self
+    def _connect(self):
+        return _sqlite_transaction(self.path)
 
-    def __exit__(self, exception_type, exception_value, exception_traceback):
-        self.disconnect()
+    def _get_state(self, db, name):
+        row = db.execute("SELECT Value FROM catalog_state WHERE Name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, db, name, value):
+        db.execute("INSERT OR REPLACE INTO catalog_state (Name, Value) VALUES (?, ?)", (name, value))
 
-    def connect(self, username, password):
+    @property
+    def changes_since_token(self):
+        """The change token of the last refresh, or None when the catalog has never been refreshed"""
+        with self._connect() as db:
+            return self._get_state(db, 'ChangesSinceToken')
+
+    def refresh(self, full=False, prune=False):
         """
-        Authenticates the session with AQUARIUS.
+        Brings the catalog up to date with the server.
 
-        All subsequent requests to any public endpoint will be authenticated using the stored session token.
+        :param full: When True, reloads every description, even when a change token is available
+        :param prune: When True, also drops the time-series which no longer exist on the server
+        :return: A dictionary counting the 'Locations' and 'TimeSeries' descriptions which were fetched, and the 'Deleted' time-series
         """
-        token = self.publish._post_raw('/session', json={'Username': username, 'EncryptedPassword': password}).text
-        self.publish.set_session_token(token)
-        self.acquisition.set_session_token(token)
-        self.provisioning.set_session_token(token)
+        with self._connect() as db:
+            token = self._get_state(db, 'ChangesSinceToken')
+            base_url = self._get_state(db, 'BaseUrl')
 
-        return token
+        if base_url not in (None, self.client.publish.base_url):
+            raise ValueError(f'{self.path} is a catalog of {base_url}, not {self.client.publish.base_url}')
 
-    def disconnect(self):
-        """Destroys the authenticated session"""
-        self.publish.delete('/session')
+        if full or token is None:
+            return self._full_refresh()
 
-    def _configure_reauthentication(self, username, password):
-        self._username = username
-        self._password = password
-        self._reauthenticating = False
-        self._reauthenticate_session = requests.Session()
+        changes = self.client.publish.get('/GetTimeSeriesUniqueIdList', params={'ChangesSinceToken': token})
 
-        self.publish.hooks['response'].append(self._reauthenticate)
-        self.acquisition.hooks['response'].append(self._reauthenticate)
-        self.provisioning.hooks['response'].append(self._reauthenticate)
+        if changes.get('TokenExpired'):
+            return self._full_refresh()
 
-    def _reauthenticate(self, response, *args, **kwargs):
-        if response.status_code == 401 and not self._reauthenticating:
-            self._reauthenticating = True
-            token = self.connect(self._username, self._password)
+        with self._connect() as db:
+            known = {row[0] for row in db.execute("SELECT UniqueId FROM time_series")}
 
-            response.request.headers.update({"X-Authentication-Token": token})
+        changed_ids = [item['UniqueId'] for item in changes.get('TimeSeriesUniqueIds', [])
+                       if item.get('HasAttributeChange') or item['UniqueId'] not in known]
 
-            new_response = self._reauthenticate_session.send(response.request, **kwargs)
-            self._reauthenticating = False
+        descriptions = self._fetch_time_series_descriptions(changed_ids)
 
-            return new_response
+        # Changed series which no longer have a description were deleted
+        deleted = set(changed_ids) - {d['UniqueId'] for d in descriptions}
 
-    def _create_authenticated_endpoint(self, root_path: str, verify=True) -> TimeSeriesSession:
+        if prune:
+            existing = {item['UniqueId'] for item in self.client.publish.get('/GetTimeSeriesUniqueIdList')['TimeSeriesUniqueIds']}
+            deleted |= known - existing
+
+        with self._connect() as db:
+            known_locations = {row[0].lower() for row in db.execute("SELECT Identifier FROM locations")}
+
+        new_locations = sorted({d['LocationIdentifier'] for d in descriptions if d['LocationIdentifier'].lower() not in known_locations})
+        locations = [location for descriptions_at_location in ordered_concurrent_map(
+            lambda identifier: self.client.getLocationDescriptionList(LocationIdentifier=identifier),
+            new_locations, self.max_concurrency) for location in descriptions_at_location]
+
+        with self._connect() as db:
+            self._save_locations(db, locations)
+            self._save_time_series(db, descriptions)
+            db.executemany("DELETE FROM time_series WHERE UniqueId = ?", [(unique_id,) for unique_id in deleted])
+            self._set_state(db, 'ChangesSinceToken', changes['NextToken'])
+
+        return {'Locations': len(locations), 'TimeSeries': len(descriptions), 'Deleted': len(deleted)}
+
+    def _full_refresh(self):
+        # Take the change token first, so that nothing changing during the download is missed by the next refresh
+        token = self.client.publish.get('/GetTimeSeriesUniqueIdList')['NextToken']
+
+        locations = self.client.getLocationDescriptionList()
+        descriptions = self.client.getTimeSeriesDescriptions()
+
+        with self._connect() as db:
+            db.execute("DELETE FROM locations")
+            db.execute("DELETE FROM time_series")
+            self._save_locations(db, locations)
+            self._save_time_series(db, descriptions)
+            self._set_state(db, 'ChangesSinceToken', token)
+            self._set_state(db, 'BaseUrl', self.client.publish.base_url)
+
+        return {'Locations': len(locations), 'TimeSeries': len(descriptions), 'Deleted': 0}
+
+    def _fetch_time_series_descriptions(self, unique_ids):
+        def fetch(batch):
+            return self.client.publish.get(
+                '/GetTimeSeriesDescriptionListByUniqueId',
+                params={'TimeSeriesUniqueIds': self.client.publish.toJSV(batch)})['TimeSeriesDescriptions']
+
+        return [description
+                for descriptions in ordered_concurrent_map(fetch, batches(unique_ids, self.batch_size), self.max_concurrency)
+                for description in descriptions]
+
+    @staticmethod
+    def _save_locations(db, locations):
+        db.executemany(
+            "INSERT OR REPLACE INTO locations (UniqueId, Identifier, Name, PrimaryFolder, Description) VALUES (?, ?, ?, ?, ?)",
+            [(d['UniqueId'], d['Identifier'], d.get('Name'), d.get('PrimaryFolder'), json.dumps(d)) for d in locations])
+
+    @staticmethod
+    def _save_time_series(db, descriptions):
+        db.executemany(
+            "INSERT OR REPLACE INTO time_series (UniqueId, Identifier, LocationIdentifier, Parameter, Label, Publish,"
+            " ComputationIdentifier, ComputationPeriodIdentifier, Description) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(d['UniqueId'], d['Identifier'], d.get('LocationIdentifier'), d.get('Parameter'), d.get('Label'), d.get('Publish'),
+              d.get('ComputationIdentifier'), d.get('ComputationPeriodIdentifier'), json.dumps(d)) for d in descriptions])
+
+    @staticmethod
+    def _like_pattern(text):
+        """Converts an AQTS '*' wildcard filter into a SQL LIKE pattern"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('*', '%')
+
+    def getTimeSeriesDescriptions(self, locationIdentifier=None, parameter=None, publish=None, computationIdentifier=None, computationPeriodIdentifier=None, extendedFilters=None):
         """
-        Creates an authenticated endpoint to something other than the public API surface.
+        Gets the time-series descriptions matching the filters, like timeseries_client.getTimeSeriesDescriptions() does.
 
-        :param root_path: The path to the endpoint on the AQTS app server
-        :param verify: The standard requests library certificate check
-        :return: An authenticated session for making requests to the end point
+        :param extendedFilters: A list of {'FilterName': name, 'FilterValue': value} dictionaries, matched against the extended attributes
         """
-        url = urlparse(self.publish.base_url)
-        session = TimeSeriesSession(f'{url.scheme}://{url.hostname}', root_path, verify=verify)
-        session.set_session_token(self.publish.headers['X-Authentication-Token'])
-        return session
+        columns = {
+            'LocationIdentifier': locationIdentifier,
+            'Parameter': parameter,
+            'Publish': publish,
+            'ComputationIdentifier': computationIdentifier,
+            'ComputationPeriodIdentifier': computationPeriodIdentifier}
+        conditions = [(f'{column} = ?', value) for column, value in columns.items() if value is not None]
 
-    def isVersionLessThan(self, source_version, target_version=None):
+        descriptions = self._query('time_series', conditions)
+
+        for extendedFilter in extendedFilters or []:
+            descriptions = [d for d in descriptions if any(
+                attribute.get('Name') == extendedFilter['FilterName'] and str(attribute.get('Value')) == str(extendedFilter['FilterValue'])
+                for attribute in d.get('ExtendedAttributes') or [])]
+
+        return descriptions
+
+    def getLocationDescriptionList(self, LocationName=None, LocationIdentifier=None, LocationFolder=None):
         """
-        Is the source version strictly less than the target version.
+        Gets the location descriptions matching the filters, like timeseries_client.getLocationDescriptionList() does.
 
-        :param source_version: The source version, in dotted.string notation
-        :param target_version: If None, the connected server version is used
-        :return: True if the source version is strictly less than the target version
+        LocationName and LocationIdentifier can contain '*' wildcards. LocationFolder also matches all of its subfolders.
         """
-        if target_version is None:
-            target_version = self.server_version
+        conditions = []
 
-        if not isinstance(source_version, ServerVersion):
-            source_version = ServerVersion(source_version)
+        if LocationName is not None:
+            conditions.append(("Name LIKE ? ESCAPE '\\'", self._like_pattern(LocationName)))
+        if LocationIdentifier is not None:
+            conditions.append(("Identifier LIKE ? ESCAPE '\\'", self._like_pattern(LocationIdentifier)))
+        if LocationFolder is not None:
+            conditions.append(("(PrimaryFolder = ? OR PrimaryFolder LIKE ? ESCAPE '\\')",
+                               (LocationFolder, self._like_pattern(LocationFolder) + '.%')))
 
-        return source_version < target_version
+        return self._query('locations', conditions)
 
-    def isServerVersionLessThan(self, target_version):
-        return self.isVersionLessThan(self.server_version, target_version)
+    def _query(self, table, conditions):
+        where = ' AND '.join(condition for condition, _ in conditions) or '1'
+        parameters = []
 
-    @staticmethod
-    def iso8601(datetime):
-        """Formats the datetime object as an ISO8601 timestamp"""
-        return pyrfc3339.generate(datetime, microseconds=True)
+        for _, value in conditions:
+            parameters.extend(value if isinstance(value, tuple) else (value,))
 
-    @staticmethod
-    def datetime(text):
-        """Parses the ISO8601 timestamp to a standard python datetime object"""
-        if text[10:19] == "T24:00:00":
-            # Deal with the quirky end-of-day timestamps from the AQTS Publish API
-            # Parse a normalized version and add a day
-            return pyrfc3339.parse(text.replace("T24:", "T00:")) + timedelta(days=1)
+        with self._connect() as db:
+            return [json.loads(row[0]) for row in db.execute(
+                f"SELECT Description FROM {table} WHERE {where} ORDER BY Identifier", parameters)]
 
-        return pyrfc3339.parse(text)
 
-    def coerceQueryTime(self, querytime):
+class TimeSeriesMirror:
+    """
+    Keeps a local copy of the corrected point data of many time-series up to date, by fetching only what changed.
+
+    The sync state lives in a SQLite file: the GetTimeSeriesUniqueIdList change token, plus the high-water mark
+    and any pending re-fetch of each tracked time-series. Each sync() asks the server which series changed since
+    the stored token, and only re-fetches each changed series from its FirstPointChanged time onwards.
+
+    Every fetched response is handed to the sink callback, as sink(uniqueId, queryFrom, response).
+    The sink must replace all of its stored points at or after queryFrom (or all of them, when queryFrom is None)
+    with the response's points.
+
+    The new token and the pending re-fetches are saved together, and each series is only marked as synced after its
+    sink call returns. So a sync which crashes part way through simply carries on from where it stopped on the next run.
+    A series can be handed to the sink again after a crash, which is harmless since the sink replaces points.
+
+    >>> mirror = TimeSeriesMirror(client, '/var/lib/aqts/mirror.sqlite', sink=store.replace_points, max_concurrency=8)
+    >>> mirror.track(['Stage.Working@Loc1', 'Discharge.Working@Loc1'])
+    >>> mirror.sync()
+    """
+
+    _schema = [
+        "CREATE TABLE IF NOT EXISTS mirror_state (Name TEXT PRIMARY KEY, Value TEXT)",
+        "CREATE TABLE IF NOT EXISTS series ("
+        " UniqueId TEXT PRIMARY KEY, HighWaterMark TEXT, IsPending INTEGER NOT NULL, PendingFrom TEXT, LastSynced TEXT)",
+        "CREATE INDEX IF NOT EXISTS series_pending ON series (IsPending)",
+    ]
+
+    def __init__(self, client, path, sink, max_concurrency=4):
+        self.client = client
+        self.path = path
+        self.sink = sink
+        self.max_concurrency = max_concurrency
+
+        with self._connect() as db:
+            for statement in self._schema:
+                db.execute(statement)
+
+    def _connect(self):
+        return _sqlite_transaction(self.path)
+
+    def track(self, timeSeriesIdentifiers):
         """
-        Coerces the timevalue into a best possible query time format.
+        Starts mirroring the time-series. Their full history is fetched by the next sync().
 
-        Naive datetimes are treated as client-local times.
-        Unambiguous datetimes are formated as ISO8601.
-        Non datetime objects are left as-is.
+        :param timeSeriesIdentifiers: A list of time-series identifiers or unique IDs
+        :return: The unique IDs of the time-series
+        """
+        unique_ids = self.client.getTimeSeriesUniqueIds(timeSeriesIdentifiers)
 
-        :param querytime: a datetime to
-        :return: The coerced text value
+        with self._connect() as db:
+            db.executemany("INSERT OR IGNORE INTO series (UniqueId, IsPending, PendingFrom) VALUES (?, 1, NULL)",
+                           [(unique_id,) for unique_id in unique_ids])
+
+        return unique_ids
+
+    def untrack(self, timeSeriesIdentifiers):
+        """Stops mirroring the time-series"""
+        unique_ids = self.client.getTimeSeriesUniqueIds(timeSeriesIdentifiers)
+
+        with self._connect() as db:
+            db.executemany("DELETE FROM series WHERE UniqueId = ?", [(unique_id,) for unique_id in unique_ids])
+
+    def status(self):
+        """Gets the sync state of every tracked time-series, as a dictionary keyed by unique ID"""
+        with self._connect() as db:
+            return {row[0]: {'HighWaterMark': row[1], 'IsPending': bool(row[2]), 'PendingFrom': row[3], 'LastSynced': row[4]}
+                    for row in db.execute("SELECT UniqueId, HighWaterMark, IsPending, PendingFrom, LastSynced FROM series")}
+
+    def sync(self):
         """
-        if isinstance(querytime, datetime):
-            if querytime.tzinfo is None:
-                # Format naive date times as a local time
-                return querytime.strftime('%Y-%m-%d %H:%M:%S.%f')
+        Finds the tracked time-series which changed since the last sync, and fetches just their changed points.
+
+        :return: A dictionary counting the 'Changed' series, the 'Synced' series and the 'Points' which were fetched
+        """
+        changed = self._find_changes()
+
+        with self._connect() as db:
+            pending = db.execute("SELECT UniqueId, PendingFrom FROM series WHERE IsPending = 1 ORDER BY UniqueId").fetchall()
+
+        points = 0
+
+        for point_count in ordered_concurrent_map(lambda row: self._sync_series(*row), pending, self.max_concurrency):
+            points += point_count
+
+        return {'Changed': changed, 'Synced': len(pending), 'Points': points}
+
+    def _find_changes(self):
+        with self._connect() as db:
+            row = db.execute("SELECT Value FROM mirror_state WHERE Name = 'ChangesSinceToken'").fetchone()
+            token = row[0] if row else None
+
+        if token is None:
+            # Everything tracked so far is already pending a full fetch
+            changes = self.client.publish.get('/GetTimeSeriesUniqueIdList')
+            changes['TimeSeriesUniqueIds'] = []
+        else:
+            changes = self.client.publish.get('/GetTimeSeriesUniqueIdList', params={'ChangesSinceToken': token})
+
+        with self._connect() as db:
+            if changes.get('TokenExpired'):
+                # The changes since the token are unknown, so start over from each series' full history
+                changed = db.execute("UPDATE series SET IsPending = 1, PendingFrom = NULL").rowcount
+                changes = self.client.publish.get('/GetTimeSeriesUniqueIdList')
             else:
-                # Format unambiguous times as ISO8061
-                return self.iso8601(querytime)
+                changed = 0
 
-        # Otherwise return the value as-is and hope for the best
-        return querytime
+                for item in changes['TimeSeriesUniqueIds']:
+                    first_point_changed = item.get('FirstPointChanged')
+                    if first_point_changed is None:
+                        # Only the attributes of the series have changed
+                        continue
 
-    def getTimeSeriesUniqueId(self, timeSeriesIdentifier):
+                    row = db.execute("SELECT IsPending, PendingFrom FROM series WHERE UniqueId = ?", (item['UniqueId'],)).fetchone()
+                    if row is None:
+                        continue
+
+                    is_pending, pending_from = row
+                    if is_pending and (pending_from is None or _parse_timestamp(pending_from) <= _parse_timestamp(first_point_changed)):
+                        # An earlier re-fetch is already pending
+                        continue
+
+                    db.execute("UPDATE series SET IsPending = 1, PendingFrom = ? WHERE UniqueId = ?", (first_point_changed, item['UniqueId']))
+                    changed += 1
+
+            db.execute("INSERT OR REPLACE INTO mirror_state (Name, Value) VALUES ('ChangesSinceToken', ?)", (changes['NextToken'],))
+
+        return changed
+
+    def _sync_series(self, unique_id, pending_from):
+        response = self.client.getTimeSeriesCorrectedData(unique_id, queryFrom=pending_from)
+
+        self.sink(unique_id, pending_from, response)
+
+        points = response.get('Points', [])
+
+        with self._connect() as db:
+            row = db.execute("SELECT PendingFrom, HighWaterMark FROM series WHERE UniqueId = ?", (unique_id,)).fetchone()
+
+            if row is None or row[0] != pending_from:
+                # The series was untracked, or a sync in another process has queued an earlier re-fetch
+                return len(points)
+
+            high_water_mark = row[1]
+
+            if points:
+                high_water_mark = points[-1]['Timestamp']
+            elif pending_from is None or (high_water_mark is not None and _parse_timestamp(high_water_mark) >= _parse_timestamp(pending_from)):
+                # Every point from pending_from onwards has been removed, so the last remaining point is unknown
+                high_water_mark = None
+
+            db.execute(
+                "UPDATE series SET IsPending = 0, PendingFrom = NULL, HighWaterMark = ?, LastSynced = ? WHERE UniqueId = ?",
+                (high_water_mark, datetime.now(timezone.utc).isoformat(), unique_id))
+
+        return len(points)
+
+
+class PointStore:
+    """
+    A local on-disk store of corrected time-series points, read back as memory-mapped NumPy arrays.
+
+    Each time-series gets its own directory, named by its UniqueId, holding one raw array file per column:
+
+    timestamps.i8      => The int64 UTC times of the points, in microseconds since 1970. This sorted column is the time index.
+    values.f8          => The float64 point values, with NaN for any point without a numeric value
+    grade_codes.i4     => The int32 grade code of each point
+    approval_levels.i4 => The int32 approval level of each point
+    meta.json          => The point count, the column file generation, the UTC offset, and every other response property,
+                          like 'Grades' or 'Approvals'
+
+    Reads map the files into memory and return TimeSeriesPoints whose arrays are slices of the mappings, so reading
+    any time range of a multi-decade series costs a binary search, and only the pages actually touched are loaded.
+
+    Appending newer points extends the column files in place, beyond the point count that readers map.
+    Replacing stored points writes a complete new set of column files, like timestamps.2.i8, under the next generation number.
+    Either way, meta.json is atomically replaced last to switch readers to the new points,
+    so a crash while writing never exposes a partial write.
+
+    >>> store = PointStore('/var/cache/aqts/points')
+    >>> store.download(client, 'Stage.Working@Loc1')
+    >>> points = store.read('Stage.Working@Loc1', client=client, start=datetime(2010, 1, 1, tzinfo=timezone.utc))
+    >>> mirror = TimeSeriesMirror(client, '/var/cache/aqts/mirror.sqlite', sink=store.mirror_sink)
+
+    Requires the numpy package.
+    """
+
+    _columns = (
+        ('timestamps', 'timestamps.i8', np.int64 if np else None),
+        ('values', 'values.f8', np.float64 if np else None),
+        ('grade_codes', 'grade_codes.i4', np.int32 if np else None),
+        ('approval_levels', 'approval_levels.i4', np.int32 if np else None),
+    )
+
+    def __init__(self, directory):
+        if np is None:
+            raise ImportError('PointStore requires the numpy package. Install it via: $ pip install numpy')
+
+        self.directory = directory
+
+    def _path(self, unique_id, filename, generation=0):
+        if generation:
+            # Generation 0 uses the plain file names
+            stem, extension = os.path.splitext(filename)
+            filename = f'{stem}.{generation}{extension}'
+
+        return os.path.join(self.directory, unique_id, filename)
+
+    def _unique_id(self, timeSeriesIdentifier, client):
+        return client.getTimeSeriesUniqueId(timeSeriesIdentifier) if client is not None else timeSeriesIdentifier
+
+    def _read_meta(self, unique_id):
+        try:
+            with open(self._path(unique_id, 'meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, unique_id, meta):
+        path = self._path(unique_id, 'meta.json')
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Atomically replace the file, so readers never see a partially written point count
+        os.replace(temp_path, path)
+
+    def contains(self, timeSeriesIdentifier, client=None):
+        return self._read_meta(self._unique_id(timeSeriesIdentifier, client)) is not None
+
+    def download(self, client, timeSeriesIdentifier, **kwargs):
         """
-        Gets the unique ID of a time-series.
+        Downloads the corrected points of a time-series into the store, replacing any points already stored.
+
+        Any other keyword arguments, like queryFrom or getParts, are passed to getTimeSeriesCorrectedDataColumns().
+
+        :return: The unique ID of the series
+        """
+        unique_id = client.getTimeSeriesUniqueId(timeSeriesIdentifier)
+
+        self.write(unique_id, client.getTimeSeriesCorrectedDataColumns(unique_id, **kwargs))
+
+        return unique_id
+
+    def write(self, unique_id, points):
+        """Stores the TimeSeriesPoints of a series, replacing any points already stored"""
+        self.replace_from(unique_id, None, points)
+
+    def append(self, unique_id, points):
+        """
+        Appends newer TimeSeriesPoints to a stored series.
+
+        :raises ValueError: When the points do not all come after the last stored point
+        """
+        meta = self._read_meta(unique_id)
+
+        if meta is None:
+            return self.write(unique_id, points)
+
+        if not len(points):
+            return
+
+        first = points.timestamps[0].astype('datetime64[us]')
+
+        if meta['Count'] and first.astype(np.int64) <= self._map(unique_id, 'timestamps.i8', np.int64, meta)[-1]:
+            raise ValueError(f'The appended points of {unique_id} must all come after the last stored point')
+
+        self.replace_from(unique_id, first, points)
+
+    def replace_from(self, unique_id, start, points):
+        """
+        Replaces all the stored points of a series at or after start with the TimeSeriesPoints.
+
+        :param start: A datetime, a datetime64, or ISO 8601 text. None replaces every stored point.
+        """
+        if points.values.ndim != 1:
+            raise ValueError('Only single time-series points can be stored')
+
+        os.makedirs(os.path.join(self.directory, unique_id), exist_ok=True)
+
+        stored_meta = self._read_meta(unique_id)
+        generation = stored_meta.get('Generation', 0) if stored_meta is not None else 0
+        meta = stored_meta if start is not None else None
+        kept = 0
+
+        if meta is not None:
+            start = self._to_microseconds(start)
+            kept = int(np.searchsorted(self._map(unique_id, 'timestamps.i8', np.int64, meta), start, side='left'))
+
+        new_columns = {
+            'timestamps': points.timestamps.astype('datetime64[us]').astype(np.int64),
+            'values': points.values,
+            'grade_codes': points.grade_codes,
+            'approval_levels': points.approval_levels,
+        }
+
+        is_append = meta is not None and kept == meta['Count']
+        new_generation = generation if is_append else generation + 1
+
+        for name, filename, dtype in self._columns:
+            data = np.ascontiguousarray(new_columns[name], dtype=dtype)
+
+            if is_append:
+                # Readers only map the first Count points, so the file can be extended in place,
+                # after dropping anything left behind by an interrupted write.
+                with open(self._path(unique_id, filename, generation), 'r+b') as f:
+                    f.truncate(kept * data.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    data.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                # Replacing stored points. Write the next generation of files, since readers may still have the old ones mapped,
+                # and the old ones must stay consistent with the old meta.json until it is replaced.
+                with open(self._path(unique_id, filename, new_generation), 'wb') as f:
+                    if kept:
+                        self._map(unique_id, filename, dtype, meta, kept).tofile(f)
+                    data.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        properties = dict(points.metadata)
+
+        if meta is not None:
+            properties = self._merge_properties(meta['Properties'], properties, points, start)
+
+        utc_offset = points.utc_offset if points.utc_offset is not None else (
+            timedelta(minutes=meta['UtcOffsetMinutes']) if meta and meta['UtcOffsetMinutes'] is not None else None)
+
+        self._write_meta(unique_id, {
+            'Count': kept + len(points),
+            'Generation': new_generation,
+            'UtcOffsetMinutes': utc_offset.total_seconds() / 60 if utc_offset is not None else None,
+            'Properties': properties})
+
+        if new_generation != generation:
+            self._remove_old_generations(unique_id, new_generation)
+
+    def _remove_old_generations(self, unique_id, generation):
+        """Removes the column files of any generation older than the current one"""
+        column_filenames = {filename for _, filename, _ in self._columns}
+        directory = os.path.join(self.directory, unique_id)
+
+        for filename in os.listdir(directory):
+            stem, _, extension = filename.partition('.')
+            file_generation, _, extension = extension.rpartition('.')
+
+            if f'{stem}.{extension}' not in column_filenames:
+                continue
+
+            if file_generation and (not file_generation.isdigit() or int(file_generation) >= generation):
+                continue
+
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                # Windows won't remove a file which is still mapped. It will be removed after a later replacement.
+                pass
+
+    @staticmethod
+    def _merge_properties(stored, properties, points, start):
+        """Keeps the stored time-ranged metadata before start, merged with the new metadata"""
+        merged = {**stored, **properties}
+        start_time = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=int(start))
 
-        If the input is not a 'Parameter.Label@Location' identifier, then
-        the input is assumed to already be a unique ID and is not modified.
+        for key, value in stored.items():
+            if not _is_time_ranged_list(value) or not _is_time_ranged_list(properties.get(key, [])):
+                continue
 
-        :param timeSeriesIdentifier: The identifier to lookup
-        :return: The unique ID of the series
-        """
-        match = re.search('[^\\\\]@(?P<location>.+)$', timeSeriesIdentifier)
-        if not match:
-            return timeSeriesIdentifier
+            kept = []
+            for item in value:
+                if _parse_timestamp(item['StartTime']) < start_time:
+                    kept.append(item if _parse_timestamp(item['EndTime']) <= start_time else {
+                        **item, 'EndTime': start_time.astimezone(_parse_timestamp(item['StartTime']).tzinfo).isoformat()})
 
-        location = match.group('location')
+            merged[key] = _merge_metadata_periods(kept + properties.get(key, []))
 
-        # Get the descriptions from the location
-        try:
-            descriptions = self.publish.get(
-                '/GetTimeSeriesDescriptionList', params={'LocationIdentifier': location})[
-                "TimeSeriesDescriptions"]
-        except requests.exceptions.HTTPError as e:
-            raise LocationNotFoundException(location)
+        return merged
 
-        matches = [d for d in descriptions if d['Identifier'] == timeSeriesIdentifier]
+    @staticmethod
+    def _to_microseconds(time):
+        if isinstance(time, str):
+            time = _parse_timestamp(time)
 
-        if len(matches) != 1:
-            raise TimeSeriesNotFoundException(timeSeriesIdentifier)
+        if isinstance(time, datetime):
+            if time.tzinfo is None:
+                raise ValueError('Naive datetimes are ambiguous. Use a timezone-aware datetime instead.')
 
-        return matches[0]['UniqueId']
+            return (time - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1)
 
-    def getLocationIdentifier(self, timeSeriesOrRatingModelIdentifier):
-        """Extracts the location identifier from a 'Parameter.Label@Location' time-series or rating model identifier"""
-        match = re.search('[^\\\\]@(?P<location>.+)$', timeSeriesOrRatingModelIdentifier)
-        if not match:
-            raise LocationNotFoundException(timeSeriesOrRatingModelIdentifier)
+        return int(np.datetime64(time, 'us').astype(np.int64))
 
-        return match.group('location')
+    def _map(self, unique_id, filename, dtype, meta, count=None):
+        """Maps the first count points (defaulting to all the points) of a column file of the generation in the meta"""
+        if count is None:
+            count = meta['Count']
 
-    def getLocationData(self, identifier):
-        """Gets the location data"""
-        return self.publish.get(
-            "/GetLocationData", params={'LocationIdentifier': identifier})
+        if count == 0:
+            # Empty files cannot be memory-mapped
+            return np.empty(0, dtype=dtype)
 
-    def getLocationUniqueId(self, locationIdentifier):
+        return np.memmap(self._path(unique_id, filename, meta.get('Generation', 0)), dtype=dtype, mode='r', shape=(count,))
+
+    def read(self, timeSeriesIdentifier, start=None, end=None, client=None):
         """
-        Looks up the location unique ID from an identifier.
+        Reads the stored points of a series, from start (inclusive) up to end (exclusive).
 
-        If the the input is already a unique ID, no lookup/transformation is performed.
+        The returned arrays are read-only slices of memory-mapped files, so no points are copied.
 
-        :param locationIdentifier: The location indentifier to lookup
-        :return: The unique ID of the location
+        :param timeSeriesIdentifier: The unique ID of the series. Identifiers can be used when a client is supplied to resolve them.
+        :param start: An optional timezone-aware datetime, datetime64, or ISO 8601 text
+        :param end: An optional timezone-aware datetime, datetime64, or ISO 8601 text
+        :return: A TimeSeriesPoints object, or None if the series is not stored
         """
-        if re.match('^[0-9a-f]{32}$', locationIdentifier):
-            # Return existing GUIDs as-is
-            return locationIdentifier
+        unique_id = self._unique_id(timeSeriesIdentifier, client)
 
-        locationData = self.getLocationData(locationIdentifier)
+        while True:
+            meta = self._read_meta(unique_id)
 
-        return locationData['UniqueId']
+            if meta is None:
+                return None
 
-    def getRatings(self, locationIdentifier, queryFrom=None, queryTo=None, inputParameter=None, outputParameter=None):
-        ratingModelDescriptions = self.publish.get(
-            "/GetRatingModelDescriptionList",
-            params={
-                'LocationIdentifier': locationIdentifier,
-                'QueryFrom': self.coerceQueryTime(queryFrom),
-                'QueryTo': self.coerceQueryTime(queryTo),
-                'InputParameter': inputParameter,
-                'OutputParameter': outputParameter
-            })['RatingModelDescriptions']
+            try:
+                columns = {name: self._map(unique_id, filename, dtype, meta) for name, filename, dtype in self._columns}
+                break
+            except FileNotFoundError:
+                # A concurrent replacement removed this generation after its meta.json was read, so read the new one
+                latest_meta = self._read_meta(unique_id)
 
-        # TODO: Get the rating curves in effect during those times
-        return ratingModelDescriptions
+                if latest_meta is None or latest_meta.get('Generation', 0) == meta.get('Generation', 0):
+                    raise
+        timestamps = columns['timestamps']
 
-    def getRatingModelOutputValues(self, ratingModelIdentifier, inputValues, effectiveTime=None, applyShifts=None):
-        return self.publish.get(
-            "/GetRatingModelOutputValues",
-            params={
-                'RatingModelIdentifier': ratingModelIdentifier,
-                'InputValues': inputValues,
-                'EffectiveTime': self.coerceQueryTime(effectiveTime),
-                'ApplyShifts': applyShifts
-            })['OutputValues']
+        first = int(np.searchsorted(timestamps, self._to_microseconds(start), side='left')) if start is not None else 0
+        stop = int(np.searchsorted(timestamps, self._to_microseconds(end), side='left')) if end is not None else len(timestamps)
 
-    def getFieldVisits(self, locationIdentifier, queryFrom=None, queryTo=None, activityType=None):
-        fieldVisitDescriptions = self.publish.get(
-            "/GetFieldVisitDescriptionList",
-            params={
-                'LocationIdentifier': locationIdentifier,
-                'QueryFrom': self.coerceQueryTime(queryFrom),
-                'QueryTo': self.coerceQueryTime(queryTo),
-                'ActivityType': activityType
-            })['FieldVisitDescriptions']
+        utc_offset = timedelta(minutes=meta['UtcOffsetMinutes']) if meta['UtcOffsetMinutes'] is not None else None
 
-        # TODO: Fetch details for each visit
-        return fieldVisitDescriptions
+        return TimeSeriesPoints(
+            timestamps[first:stop].view('datetime64[us]'),
+            utc_offset,
+            columns['values'][first:stop],
+            columns['grade_codes'][first:stop],
+            columns['approval_levels'][first:stop],
+            meta['Properties'])
 
-    def getTimeSeriesDescriptions(self, locationIdentifier=None, parameter=None, publish=None, computationIdentifier=None, computationPeriodIdentifier=None, extendedFilters=None):
-        return self.publish.get(
-            "/GetTimeSeriesDescriptionList",
-            params={
-                'LocationIdentifier': locationIdentifier,
-                'Parameter': parameter,
-                'Publish': publish,
-                'ComputationIdentifier': computationIdentifier,
-                'ComputationPeriodIdentifier': computationPeriodIdentifier,
-                'ExtendedFilters': self.publish.toJSV(extendedFilters)
-            })['TimeSeriesDescriptions']
+    def mirror_sink(self, unique_id, query_from, response):
+        """A TimeSeriesMirror sink, keeping the store in sync with the server"""
+        self.replace_from(unique_id, query_from, TimeSeriesPoints.from_response(response))
 
-    def getTimeSeriesData(self, timeSeriesIds, queryFrom=None, queryTo=None, outputUnitIds=None, includeGapMarkers=None):
-        if isinstance(timeSeriesIds, list):
-            timeSeriesIds = [self.getTimeSeriesUniqueId(ts) for ts in timeSeriesIds]
-        else:
-            timeSeriesIds = self.getTimeSeriesUniqueId(timeSeriesIds)
+    def delete(self, unique_id):
+        """Removes a series from the store"""
+        directory = os.path.join(self.directory, unique_id)
 
-        return self.publish.get(
-            "/GetTimeSeriesData",
-            params={
-                'TimeSeriesUniqueIds': self.publish.toJSV(timeSeriesIds),
-                'TimeSeriesOutputUnitIds': self.publish.toJSV(outputUnitIds),
-                'QueryFrom': self.coerceQueryTime(queryFrom),
-                'QueryTo': self.coerceQueryTime(queryTo),
-                'IncludeGapMarkers': includeGapMarkers
-            })
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+            os.rmdir(directory)
 
-    def getTimeSeriesCorrectedData(self, timeSeriesIdentifier, queryFrom=None, queryTo=None, getParts=None, includeGapMarkers=None):
-        return self.publish.get(
-            "/GetTimeSeriesCorrectedData",
-            params={
-                'TimeSeriesUniqueId': self.getTimeSeriesUniqueId(timeSeriesIdentifier),
-                'QueryFrom': self.coerceQueryTime(queryFrom),
-                'QueryTo': self.coerceQueryTime(queryTo),
-                'GetParts': getParts,
-                'IncludeGapMarkers': includeGapMarkers
-            })
 
-    def flattenResponse(self, response):
-        """Flattens the metadata in the response, adding point-wise metadata to the 'Points' list"""
-        grades = SingleMetadataResolver(response['Grades'])
-        approvals = SingleMetadataResolver(response['Approvals'])
-        methods = SingleMetadataResolver(response['Methods'])
-        gapTolerances = SingleMetadataResolver(response['GapTolerances'])
-        qualifiers = OverlappingMetadataResolver(response['Qualifiers'])
-        notes = OverlappingMetadataResolver(response['Notes'])
+class AsyncTimeSeriesSession:
+    """
+    An asyncio wrapper around a TimeSeriesSession.
 
-        for point in response['Points']:
-            timestamp = point['Timestamp']
-            point['GradeCode'] = grades.resolve(timestamp)
-            point['Approval'] = approvals.resolve(timestamp)
-            point['Method'] = methods.resolve(timestamp)
-            point['GapTolerance'] = gapTolerances.resolve(timestamp)
-            point['Qualifiers'] = qualifiers.resolve(timestamp)
-            point['Notes'] = notes.resolve(timestamp)
+    Every request is run on the owning client's bounded worker pool, so any number of requests
+    can be gathered without ever opening more connections than the pool allows.
 
-    def getReportList(self):
-        """Gets all the generated reports on the system"""
-        return self.publish.get("/GetReportList")['Reports']
+    >>> location = await timeseries.publish.get('/GetLocationData', params={'LocationIdentifier': 'Loc1'})
+    """
 
-    def deleteReport(self, reportUniqueId):
-        """Deletes the generated report from the system"""
-        self.acquisition.delete(f"/attachments/reports/{reportUniqueId}")
+    def __init__(self, session, run):
+        self.session = session
+        self._run = run
 
-    def uploadExternalReport(self, locationUniqueId, pathToFile, title, deleteDuplicateReports=False):
-        """Uploads a file as external report to the given location"""
-        if deleteDuplicateReports:
-            # Get the current reports
-            for r in [r for r in self.getReportList() if r['Title'] == title and not r['IsTransient']]:
-                self.deleteReport(r['ReportUniqueId'])
+    @property
+    def base_url(self):
+        return self.session.base_url
 
-        return self.acquisition.post(f"/locations/{locationUniqueId}/attachments/reports",
-                                     params={'Title': title},
-                                     files={'file': open(pathToFile, 'rb')})
+    async def get(self, url, **kwargs):
+        return await self._run(self.session.get, url, **kwargs)
 
-    def uploadFieldVisit(self, locationUniqueId, pathToFile):
-        """Uploads a file as a field visit to the given location"""
-        return self.acquisition.post(f"/locations/{locationUniqueId}/visits/upload/plugins",
-                                     files={'file': open(pathToFile, 'rb')})
+    async def post(self, url, data=None, json=None, **kwargs):
+        return await self._run(self.session.post, url, data, json, **kwargs)
 
-    def createLocation(self, location):
-        """ Creates a new location as specified by location dict.
-            See API docs for Location JSON/dict struct.
-            :param location: dict
-            :return: unique ID (str) of created location"""
-        response = self.provisioning.post('/locations', json=location)
+    async def put(self, url, data=None, **kwargs):
+        return await self._run(self.session.put, url, data, **kwargs)
 
-        return response['UniqueId']
+    async def delete(self, url, **kwargs):
+        return await self._run(self.session.delete, url, **kwargs)
 
-    def getLocationDescriptionList(self, **kwargs):
-        locations = self.publish.get('/GetLocationDescriptionList', params=kwargs)
-        return locations['LocationDescriptions']
+    async def send_batch_requests(self, route_or_operation_name, requests, batch_size=100, verb="GET", **kwargs):
+        return await self._run(self.session.send_batch_requests, route_or_operation_name, requests, batch_size, verb, **kwargs)
 
-    def getAllLocations(self, **kwargs):
-        """
-        Gets all the locations in a system.
+    def toJSV(self, item):
+        return self.session.toJSV(item)
 
-        :return: A list of Provisioning location objects
-        """
-        descriptions = self.getLocationDescriptionList(**kwargs)
 
-        return self.provisioning.send_batch_requests(
-            '/locations/{Id}',
-            [{'LocationUniqueId': loc['UniqueId']} for loc in descriptions])
+class AsyncStreamedJsonResponse:
+    """
+    An asyncio wrapper around a StreamedJsonResponse.
 
-    def deleteLocation(self, location_identifier_or_unique_id):
-        """
-        Deletes a location, by location identifier or by unique ID.
+    Each chunk is read and parsed on the owning client's worker pool, so the event loop is never blocked by the response body.
 
-        Note: The location needs to be completely empty.
-        See https://github.com/AquaticInformatics/examples/tree/master/TimeSeries/PublicApis/SdkExamples/LocationDeleter#locationdeleter for an alternative tool.
+    >>> async with await timeseries.streamTimeSeriesCorrectedData('Stage.Working@Loc1') as data:
+    ...   async for points in data:
+    ...     process(points)
+    ...   approvals = data.properties['Approvals']
+    """
 
-        :param location_identifier_or_unique_id: A location identifier or a unique ID string
-        """
-        location_unique_id = self.getLocationUniqueId(location_identifier_or_unique_id)
+    def __init__(self, streamed, iterate, run):
+        self.streamed = streamed
+        self._chunks = iterate(streamed)
+        self._run = run
 
-        return self.provisioning.delete(f'/locations/{location_unique_id}')
+    @property
+    def properties(self):
+        return self.streamed.properties
 
-    def createReflectedTimeseries(self, location_identifier_or_unique_id, series):
-        """
-        Creates a reflected time-series at a location with the given attributes
+    async def __aenter__(self):
+        return self
 
-        :param location_identifier_or_unique_id: A location identifier or a unique ID string
-        :param series: dict (see API docs)
-        :return: unique ID of create time-series
-        """
-        location_unique_id = self.getLocationUniqueId(location_identifier_or_unique_id)
+    async def __aexit__(self, exception_type, exception_value, exception_traceback):
+        await self.close()
 
-        response = self.provisioning.post(
-            f'/locations/{location_unique_id}/timeseries/reflected', json=series)
+    def __aiter__(self):
+        return self._chunks
 
-        return response['UniqueId']
+    async def items(self):
+        """Yields the streamed array items one at a time"""
+        async for chunk in self:
+            for item in chunk:
+                yield item
 
-    def deleteReflectedTimeseries(self, series_identifier_or_unique_id):
-        """
-        Deletes a reflected time-series.
+    async def close(self):
+        """Stops parsing and releases the connection"""
+        await self._chunks.aclose()
+        await self._run(self.streamed.close)
 
-        :param series_identifier_or_unique_id: A series identifier or unique ID
-        """
-        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
 
-        return self.provisioning.delete(f'/timeseries/{unique_id}')
+class async_timeseries_client:
+    """
+    An asyncio client wrapper for AQUARIUS Time-Series REST API consumption.
 
-    def appendReflectedPoints(self, series_identifier_or_unique_id, points, start=None, end=None):
-        """
-        Queues an append request of points to a reflected time-series.
+    Exposes the same publish, acquisition and provisioning endpoints and helper methods as timeseries_client,
+    but every network-bound call is an awaitable. At most max_connections requests are in flight at once,
+    each over a pooled keep-alive connection, so thousands of requests can safely be gathered together.
+    Any other keyword arguments are passed to the underlying timeseries_client.
 
-        If the start or end parameters are omitted, the first and last timestamp of the points are assumed.
+    >>> async with async_timeseries_client('localhost', 'admin', 'admin', max_connections=20) as timeseries:
+    ...   locations = await timeseries.getLocationDescriptionList()
+    ...   location_data = await asyncio.gather(*[timeseries.getLocationData(loc['Identifier']) for loc in locations])
+    ...
+    >>> # The session will be disconnected now, even if an exception was thrown in the body of the WITH statement.
 
-        :param series_identifier_or_unique_id: A series identifier or unique ID
-        :param points: A list of points to append
-        :param start: Optional start datetime
-        :param end: Optional end datetime
-        :return: The append job identifier
-        """
+    The streamed point methods are awaitables returning an AsyncStreamedJsonResponse,
+    and waitForCompletedAppendRequests() is an async generator. Every blocking step of either runs on the worker pool.
 
-        if start is None:
-            start = self.datetime(points[0]["Time"])
+    >>> async for identifier, status in timeseries.waitForCompletedAppendRequests(identifiers):
+    ...   print(f"{identifier}: {status['AppendStatus']}")
+    """
 
-        if end is None:
-            end = self.datetime(points[-1]["Time"]) + timedelta(microseconds=1)
+    # The timeseries_client methods which never touch the network, and so are not wrapped as awaitables
+    _local_methods = {'iso8601', 'datetime', 'coerceQueryTime', 'getLocationIdentifier',
+                      'flattenResponse', 'flattenResponseIndexes'}
 
-        series_data = {
-            'Points': points,
-            'TimeRange': {
-                'Start': start.isoformat(),
-                'End': end.isoformat()
-            }}
+    # The timeseries_client methods returning a StreamedJsonResponse, which are wrapped as an AsyncStreamedJsonResponse
+    _streamed_methods = {'streamTimeSeriesData', 'streamTimeSeriesCorrectedData'}
 
-        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
+    # The timeseries_client generator methods, which are wrapped as async generators
+    _generator_methods = {'waitForCompletedAppendRequests'}
 
-        return self.acquisition.post(
-            f'/timeseries/{unique_id}/reflected', json=series_data)["AppendRequestIdentifier"]
+    def __init__(self, hostname, username="admin", password="admin", verify=True, max_connections=10, **kwargs):
+        self._hostname = hostname
+        self._username = username
+        self._password = password
+        self._verify = verify
+        self._client_options = kwargs
+        self._client_options.setdefault('pool_size', max_connections)
+        self.max_connections = max_connections
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='timeseries_client')
+
+        self.client = None
+        self.publish = None
+        self.acquisition = None
+        self.provisioning = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
 
-    def appendPoints(self, series_identifier_or_unique_id, points, start=None, end=None):
-        """
-        Queues an append request of points to a basic time-series.
+    async def __aexit__(self, exception_type, exception_value, exception_traceback):
+        await self.disconnect()
 
-        If the start and end parameters are omitted, a basic append request is queued. Only new points will be appended.
+    async def connect(self):
+        """Creates and authenticates the underlying timeseries_client, with a connection pool sized for max_connections"""
+        self.client = await self._run(timeseries_client, self._hostname, self._username, self._password, self._verify,
+                                      **self._client_options)
 
-        When the start and end parameters are provided, an overwrite append request is queued.
+        # Fetch the lazily loaded server version now, so reading the server_version attribute never blocks the event loop
+        await self._run(getattr, self.client, 'server_version')
 
-        :param series_identifier_or_unique_id: A series identifier or unique ID
-        :param points: A list of points to append
-        :param start: Optional start datetime
-        :param end: Optional end datetime
-        :return: The append job identifier
-        """
+        self.publish = AsyncTimeSeriesSession(self.client.publish, self._run)
+        self.acquisition = AsyncTimeSeriesSession(self.client.acquisition, self._run)
+        self.provisioning = AsyncTimeSeriesSession(self.client.provisioning, self._run)
 
-        unique_id = self.getTimeSeriesUniqueId(series_identifier_or_unique_id)
-        series_data = {'Points': points}
+        return self
 
-        if start is None and end is None:
-            return self.acquisition.post(
-                f'/timeseries/{unique_id}/append', json=series_data)["AppendRequestIdentifier"]
+    async def disconnect(self):
+        """Destroys the authenticated session and releases the worker pool"""
+        try:
+            if self.client is not None:
+                await self._run(self.client.disconnect)
+        finally:
+            self._executor.shutdown(wait=False)
 
-        series_data['TimeRange'] = {
-            'Start': start.isoformat(),
-            'End': end.isoformat()
-        }
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
 
-        return self.acquisition.post(
-            f'/timeseries/{unique_id}/overwriteappend', json=series_data)["AppendRequestIdentifier"]
+    async def _iterate(self, iterable):
+        """Iterates over a blocking iterable, running each step on the worker pool"""
+        iterator = await self._run(iter, iterable)
+        done = object()
 
-    def getAppendStatus(self, append_request_identifier):
-        """
-        Gets the status of a queue append request.
+        try:
+            while True:
+                item = await self._run(next, iterator, done)
 
-        :param append_request_identifier: The request identifier
-        :return: The status of the append request
-        """
-        return self.acquisition.get(f'/timeseries/appendstatus/{append_request_identifier}')
+                if item is done:
+                    return
 
-    def waitForCompletedAppendRequest(self, append_request_identifier, timeout=timedelta(minutes=5)):
-        """
-        Waits for a queued append request to complete.
+                yield item
+        finally:
+            if inspect.isgenerator(iterator):
+                await self._run(iterator.close)
 
-        :param append_request_identifier: The request identifier
-        :param timeout: Optional timeout parameter. Can be set to None to wait forever
-        :return: The completed or failed append request status
-        """
-        started = datetime.utcnow()
-        delay = timedelta(milliseconds=50)
+    def __getattr__(self, name):
+        # Only invoked for attributes not found on this object, so every timeseries_client helper is exposed here
+        client = self.__dict__.get('client')
 
-        while True:
-            status = self.getAppendStatus(append_request_identifier)
+        if client is None:
+            raise AttributeError(f"'{name}' is not available until the client is connected")
 
-            if status['AppendStatus'] != 'Pending':
-                return status
+        attribute = getattr(client, name)
 
-            elapsed = datetime.utcnow() - started
+        if not callable(attribute) or name in self._local_methods:
+            return attribute
 
-            if timeout and elapsed > timeout:
-                return status
+        if name in self._generator_methods:
+            def async_generator(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
 
-            sleep(delay.total_seconds())
+            return async_generator
 
-            if delay < timedelta(seconds=20):
-                delay = delay * 2
+        async def awaitable(*args, **kwargs):
+            result = await self._run(attribute, *args, **kwargs)
+
+            if name in self._streamed_methods:
+                return AsyncStreamedJsonResponse(result, self._iterate, self._run)
+
+            if inspect.isgenerator(result):
+                # Never hand a blocking generator back to the event loop
+                return await self._run(list, result)
+
+            return result
+
+        return awaitable
 
 
 class SamplesSession(RestSession):
@@ -898,14 +3937,15 @@ class SamplesSession(RestSession):
     :param hostname: A thinger
     :param api_token: Another thiner
     :param callbacks: Callbacks for special handling
+    :param retry_policy: Optional RetryPolicy for transient failures. Defaults to up to 3 retries of idempotent requests.
 
     >>> samples = SamplesSession("https://myinstance.aqsamples.com", "01234567890123456789012345678901")
     >>>
     >>> # Get all the projects in the system
     >>> projects = samples.get("/v1/projects")["domainObjects"]
     """
-    def __init__(self, hostname, api_token, callbacks={}, verify=True):
-        super().__init__(hostname=hostname, root_path="/api", verify=verify)
+    def __init__(self, hostname, api_token, callbacks={}, verify=True, retry_policy=None):
+        super().__init__(hostname=hostname, root_path="/api", verify=verify, retry_policy=retry_policy)
         self.headers.update({"Authorization": f"token {api_token}"})
 
         # Callbacks must be set before any API requests are issued